@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from app import (
+    ANALYTICS_CHUNK_COLUMNS,
+    cache_resource,
+    compute_rolling_analytics,
+    summarize_period_columns,
+)
+
+
+ROLLING_KEYS = ("moving_average", "rolling_return", "volatility")
+POOL_LOCK = threading.Lock()
+
+
+class SharedPriceBuffer:
+    # A float64 matrix in shared memory, stored column-major so each column
+    # chunk is one contiguous slice. Workers attach by name instead of
+    # receiving a pickled copy.
+    def __init__(self, shape, values=None):
+        self.shape = tuple(shape)
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=max(1, int(np.prod(self.shape)) * 8)
+        )
+        self.array = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf, order="F")
+        if values is not None:
+            self.array[:] = values
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_columns(name, shape, col_start, col_stop):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order="F")[
+            :, col_start:col_stop
+        ].copy()
+    finally:
+        shm.close()
+
+
+def write_columns(name, shape, col_start, col_stop, values):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order="F")[
+            :, col_start:col_stop
+        ] = values
+    finally:
+        shm.close()
+
+
+def summarize_chunk(name, shape, index, columns, col_start, col_stop, reference_base_date, quantity_map):
+    df_chunk = pd.DataFrame(
+        read_columns(name, shape, col_start, col_stop),
+        index=pd.DatetimeIndex(index),
+        columns=columns,
+    )
+    return summarize_period_columns(df_chunk, reference_base_date, quantity_map)
+
+
+def rolling_chunk(name, output_names, shape, index, col_start, col_stop, window):
+    analytics = compute_rolling_analytics(
+        pd.DataFrame(read_columns(name, shape, col_start, col_stop), index=pd.DatetimeIndex(index)),
+        window,
+    )
+    for key, output_name in zip(ROLLING_KEYS, output_names):
+        write_columns(output_name, shape, col_start, col_stop, analytics[key].to_numpy())
+
+
+def iter_column_chunks(column_count, chunk_columns=ANALYTICS_CHUNK_COLUMNS):
+    for col_start in range(0, column_count, chunk_columns):
+        yield col_start, min(col_start + chunk_columns, column_count)
+
+
+@cache_resource(show_spinner=False)
+def get_analytics_pool_store():
+    return {}
+
+
+def get_analytics_pool():
+    # Spawned (not forked) workers, so the pool is safe to start from a
+    # multi-threaded Streamlit server; workers import only app's kernels.
+    store = get_analytics_pool_store()
+    with POOL_LOCK:
+        if "executor" not in store:
+            store["executor"] = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return store["executor"]
+
+
+def reset_analytics_pool():
+    with POOL_LOCK:
+        executor = get_analytics_pool_store().pop("executor", None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_period_summary(df_period, reference_base_date, quantity_map, executor=None):
+    executor = executor or get_analytics_pool()
+    index = df_period.index.to_numpy()
+    with SharedPriceBuffer(df_period.shape, df_period.to_numpy(dtype=float)) as buffer:
+        # A pool whose workers died while idle raises on submit, not on result.
+        try:
+            futures = [
+                executor.submit(
+                    summarize_chunk,
+                    buffer.name,
+                    buffer.shape,
+                    index,
+                    list(df_period.columns[col_start:col_stop]),
+                    col_start,
+                    col_stop,
+                    reference_base_date,
+                    quantity_map,
+                )
+                for col_start, col_stop in iter_column_chunks(df_period.shape[1])
+            ]
+            return [item for future in futures for item in future.result()]
+        except BrokenProcessPool:
+            reset_analytics_pool()
+            return summarize_period_columns(df_period, reference_base_date, quantity_map)
+
+
+def run_rolling_analytics(prices_df, window, executor=None):
+    executor = executor or get_analytics_pool()
+    index = prices_df.index.to_numpy()
+    buffers = [SharedPriceBuffer(prices_df.shape, prices_df.to_numpy(dtype=float))]
+    try:
+        buffers.extend(SharedPriceBuffer(prices_df.shape) for _ in ROLLING_KEYS)
+        output_names = [buffer.name for buffer in buffers[1:]]
+        try:
+            futures = [
+                executor.submit(
+                    rolling_chunk,
+                    buffers[0].name,
+                    output_names,
+                    prices_df.shape,
+                    index,
+                    col_start,
+                    col_stop,
+                    window,
+                )
+                for col_start, col_stop in iter_column_chunks(prices_df.shape[1])
+            ]
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            reset_analytics_pool()
+            return compute_rolling_analytics(prices_df, window)
+
+        return {
+            key: pd.DataFrame(buffer.array.copy(), index=prices_df.index, columns=prices_df.columns)
+            for key, buffer in zip(ROLLING_KEYS, buffers[1:])
+        }
+    finally:
+        for buffer in buffers:
+            buffer.close()
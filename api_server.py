@@ -0,0 +1,323 @@
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from app import (
+    CHART_PIXELS_PER_POINT,
+    EXPORT_FORMATS,
+    PRICE_RESOLUTIONS,
+    TargetConfigError,
+    attach_fx_rates,
+    build_window_level,
+    calculate_period_summary,
+    calculate_portfolio_weights,
+    fetch_fx_rates,
+    fetch_stock_data,
+    find_missing_fx_holdings,
+    get_currency_map,
+    iter_export_bytes,
+    iter_normalized_chunks,
+    iter_price_chunks,
+    load_all_targets,
+    normalize_prices_with_stats,
+    select_price_resolution,
+    with_all_holdings,
+)
+from cli import parse_window
+
+
+PRICE_TTL_SECONDS = 3600
+RESULT_TTL_SECONDS = 300
+RESULT_CACHE_SIZE = 512
+PRICE_CACHE_SIZE = 32
+GZIP_MIN_BYTES = 1024
+EXPORT_TABLES = {"prices": iter_price_chunks, "normalized": iter_normalized_chunks}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def to_json_safe(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    return value
+
+
+class SummaryService:
+    # Keeps fetched price frames for PRICE_TTL_SECONDS and encoded responses for
+    # RESULT_TTL_SECONDS, so repeated requests skip both the fetch and the JSON
+    # encoding/compression. Both caches are LRU-bounded.
+    def __init__(self, price_ttl=PRICE_TTL_SECONDS, result_ttl=RESULT_TTL_SECONDS):
+        self.price_ttl = price_ttl
+        self.result_ttl = result_ttl
+        self.lock = threading.Lock()
+        self.prices = OrderedDict()
+        self.results = OrderedDict()
+
+    def load_targets(self):
+        try:
+            return with_all_holdings(load_all_targets())
+        except TargetConfigError as exc:
+            raise ApiError(500, f"종목 설정을 불러오지 못했습니다: {exc}") from exc
+
+    def resolve_request(self, params):
+        targets_by_category = self.load_targets()
+        category = params.get("category", "")
+        if category not in targets_by_category:
+            raise ApiError(404, f"알 수 없는 카테고리입니다: {category}")
+
+        try:
+            as_of = date.fromisoformat(params["as_of"]) if params.get("as_of") else date.today()
+            _, start, end = parse_window(params.get("window", "YTD"), as_of)
+        except ValueError as exc:
+            raise ApiError(400, str(exc)) from exc
+
+        return category, targets_by_category[category], start, end
+
+    @staticmethod
+    def store_entry(cache, key, entry, ttl, limit, now):
+        # LRU insert that also drops expired entries; callers hold self.lock.
+        cache[key] = entry
+        cache.move_to_end(key)
+        for expired_key in [key for key, cached in cache.items() if now - cached[0] >= ttl]:
+            del cache[expired_key]
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def get_prices(self, category, target_records, start):
+        key = (category, start)
+        now = time.monotonic()
+        with self.lock:
+            cached = self.prices.get(key)
+            if cached is not None and now - cached[0] < self.price_ttl:
+                self.prices.move_to_end(key)
+                return cached[1], cached[2]
+
+        prices_df = fetch_stock_data(category, target_records, start)
+        currency_by_name = get_currency_map(target_records)
+        fx_rates = fetch_fx_rates(currency_by_name.values(), start)
+        with self.lock:
+            self.store_entry(
+                self.prices,
+                key,
+                (now, prices_df, (currency_by_name, fx_rates)),
+                self.price_ttl,
+                PRICE_CACHE_SIZE,
+                now,
+            )
+        return prices_df, (currency_by_name, fx_rates)
+
+    def build_payload(self, endpoint, params):
+        if endpoint == "categories":
+            return {"categories": list(self.load_targets())}
+
+        category, target_records, start, end = self.resolve_request(params)
+        prices_df, (currency_by_name, fx_rates) = self.get_prices(category, target_records, start)
+        payload = {
+            "category": category,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        }
+
+        if endpoint == "normalized":
+            names = [name for name in params.get("names", "").split(",") if name]
+            resolution = "Daily"
+            if params.get("width"):
+                try:
+                    width = int(params["width"])
+                except ValueError as exc:
+                    raise ApiError(400, f"width는 정수여야 합니다: {params['width']}") from exc
+                resolution = select_price_resolution(
+                    start, end, min_points=width / CHART_PIXELS_PER_POINT
+                )
+            period_freq = PRICE_RESOLUTIONS[resolution][0]
+            chart_prices = (
+                prices_df
+                if period_freq is None
+                else build_window_level(prices_df, period_freq, start, end)
+            )
+            norm_df, _ = normalize_prices_with_stats(
+                chart_prices, names or list(prices_df.columns), start, end, prices_df
+            )
+            payload["resolution"] = resolution
+            payload["dates"] = norm_df.index.strftime("%Y-%m-%d").tolist()
+            payload["series"] = {
+                str(column): norm_df[column].round(4).tolist() for column in norm_df.columns
+            }
+            return payload
+
+        summary = attach_fx_rates(
+            calculate_period_summary(prices_df, start, end, target_records),
+            currency_by_name,
+            fx_rates,
+        )
+        if endpoint == "summary":
+            payload["summary"] = summary
+        else:
+            payload["weights"] = calculate_portfolio_weights(summary)
+        payload["excluded"] = find_missing_fx_holdings(summary)
+        return payload
+
+    def get_response(self, endpoint, params):
+        key = (endpoint, tuple(sorted(params.items())))
+        now = time.monotonic()
+        with self.lock:
+            cached = self.results.get(key)
+            if cached is not None and now - cached[0] < self.result_ttl:
+                self.results.move_to_end(key)
+                return cached[1]
+
+        body = json.dumps(
+            to_json_safe(self.build_payload(endpoint, params)),
+            ensure_ascii=False,
+            allow_nan=False,
+        ).encode("utf-8")
+        response = {
+            "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+            "body": body,
+            "gzip_body": gzip.compress(body, compresslevel=6)
+            if len(body) >= GZIP_MIN_BYTES
+            else None,
+        }
+        with self.lock:
+            self.store_entry(
+                self.results, key, (now, response), self.result_ttl, RESULT_CACHE_SIZE, now
+            )
+        return response
+
+    def iter_export(self, params):
+        table = params.get("table", "prices")
+        export_format = params.get("format", "csv")
+        if table not in EXPORT_TABLES:
+            raise ApiError(400, f"지원하지 않는 테이블입니다: {table}")
+        if export_format not in {suffix for suffix, _ in EXPORT_FORMATS.values()}:
+            raise ApiError(400, f"지원하지 않는 형식입니다: {export_format}")
+
+        category, target_records, start, end = self.resolve_request(params)
+        prices_df, _ = self.get_prices(category, target_records, start)
+        mime = next(mime for suffix, mime in EXPORT_FORMATS.values() if suffix == export_format)
+        return mime, iter_export_bytes(EXPORT_TABLES[table](prices_df, start, end), export_format)
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/")
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            if endpoint in ("categories", "summary", "weights", "normalized"):
+                self.send_json_response(self.service.get_response(endpoint, params))
+            elif endpoint == "export":
+                mime, chunks = self.service.iter_export(params)
+                self.send_chunked_response(mime, chunks)
+            else:
+                raise ApiError(404, f"알 수 없는 경로입니다: {url.path}")
+        except ApiError as exc:
+            self.send_error_json(exc.status, exc.message)
+        except Exception:
+            traceback.print_exc()
+            self.send_error_json(500, "요청을 처리하는 중 서버 오류가 발생했습니다.")
+
+    def send_json_response(self, response):
+        if_none_match = {tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")}
+        if response["etag"] in if_none_match or "*" in if_none_match:
+            self.send_response(304)
+            self.send_header("ETag", response["etag"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response["body"]
+        use_gzip = (
+            response["gzip_body"] is not None
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", response["etag"])
+        self.send_header("Cache-Control", f"max-age={RESULT_TTL_SECONDS}")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            body = response["gzip_body"]
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunked_response(self, mime, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", mime)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+        except Exception:
+            # The status line is already sent; closing without the final chunk
+            # tells the client the export is incomplete.
+            traceback.print_exc()
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def send_error_json(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host="127.0.0.1", port=8000, service=None):
+    handler = type(
+        "BoundApiRequestHandler", (ApiRequestHandler,), {"service": service or SummaryService()}
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="성과 요약/비중/정규화 시계열 JSON API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,106 @@
+import csv
 import html
+import io
+import importlib.util
+import json
+import math
+import os
+import sys
+import threading
+import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from types import SimpleNamespace
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cache, lru_cache, wraps
 
-import pandas as pd
 
-try:
-    import FinanceDataReader as fdr
-except ImportError:
-    fdr = SimpleNamespace(DataReader=None)
+class LazyModule:
+    # Imports the wrapped module on first attribute access, so importing app.py
+    # stays cheap for tests, the CLI and cold starts.
+    def __init__(self, module_name, fallback=None):
+        self._module_name = module_name
+        self._fallback = fallback
+        self._module = None
 
-try:
-    import streamlit as st
-except ImportError:
-    class _DummyStreamlit:
-        session_state = {}
-        query_params = {}
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._module_name)
+            except ImportError:
+                if self._fallback is None:
+                    raise
+                self._module = self._fallback()
+        return self._module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+
+class _DummyStreamlit:
+    session_state = {}
+    query_params = {}
+
+    def __getattr__(self, name):
+        raise RuntimeError("streamlit is required to render the app")
+
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+fdr = LazyModule("FinanceDataReader", fallback=lambda: SimpleNamespace(DataReader=None))
+st = LazyModule("streamlit", fallback=_DummyStreamlit)
+ui = LazyModule("streamlit_shadcn_ui")
+opts = LazyModule("pyecharts.options")
+charts = LazyModule("pyecharts.charts")
+pyecharts_utils = LazyModule("pyecharts.commons.utils")
+streamlit_echarts = LazyModule("streamlit_echarts")
 
-        @staticmethod
-        def cache_data(*args, **kwargs):
-            def decorator(func):
-                return func
+APP_DEPENDENCIES = (
+    "streamlit",
+    "streamlit_shadcn_ui",
+    "pyecharts",
+    "streamlit_echarts",
+    "FinanceDataReader",
+)
 
-            return decorator
 
-        def __getattr__(self, name):
-            raise RuntimeError("streamlit is required to render the app")
+def cache_data(**cache_kwargs):
+    # Streamlit caching is only used once streamlit itself has been imported
+    # (i.e. under `streamlit run`); headless callers get the plain function.
+    def decorator(func):
+        cached_func = None
 
-    st = _DummyStreamlit()
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal cached_func
+            if "streamlit" not in sys.modules:
+                return func(*args, **kwargs)
+            if cached_func is None:
+                cached_func = st.cache_data(**cache_kwargs)(func)
+            return cached_func(*args, **kwargs)
 
-try:
-    import streamlit_shadcn_ui as ui
-except ImportError:
-    ui = None
+        return wrapper
 
-try:
-    from pyecharts import options as opts
-    from pyecharts.charts import Bar, Line, TreeMap
-except ImportError:
-    opts = None
-    Bar = None
-    Line = None
-    TreeMap = None
+    return decorator
 
-try:
-    from streamlit_echarts import st_pyecharts
-except ImportError:
-    st_pyecharts = None
+
+def cache_resource(**cache_kwargs):
+    def decorator(func):
+        cached_func = None
+        local_func = cache(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal cached_func
+            if "streamlit" not in sys.modules:
+                return local_func(*args, **kwargs)
+            if cached_func is None:
+                cached_func = st.cache_resource(**cache_kwargs)(func)
+            return cached_func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -56,6 +109,29 @@ TARGET_FILES = {
     "US Stocks": BASE_DIR / "targets" / "us_stocks.txt",
     "ETFs": BASE_DIR / "targets" / "etfs.txt",
 }
+ALL_HOLDINGS_CATEGORY = "All Holdings"
+BASE_CURRENCY = "KRW"
+FX_SYMBOLS = {"USD": "USD/KRW"}
+UNIVERSE_DIR = BASE_DIR / "targets" / "universes"
+UNIVERSE_SUFFIXES = (".csv", ".parquet")
+UNIVERSE_COLUMN_ALIASES = {
+    "code": ("code", "symbol", "ticker", "종목코드", "단축코드"),
+    "name": ("name", "종목명", "한글 종목약명"),
+    "quantity": ("quantity", "보유수량"),
+}
+UNIVERSE_BATCH_SIZE = 8192
+TARGET_WATCH_INTERVAL_SECONDS = 5
+METRIC_CARD_PAGE_SIZE = 24
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.stream"),
+}
+INTRADAY_INTERVALS = (30, 60, 300)
+INTRADAY_LOOKBACK_DAYS = 7
+METRIC_CARD_TOP_N = 12
+METRIC_CARD_MODES = ("All", "Top N", "Bottom N")
 
 CHART_COLORS = [
     "#5470c6",
@@ -70,18 +146,63 @@ CHART_COLORS = [
     "#516b91",
 ]
 
-CACHE_VERSION = "2026-04-01-kr-etf-refresh"
+CACHE_VERSION = "2026-10-19-ingest-quality"
+CORRELATION_BLOCK_SIZE = 512
+ANALYTICS_CHUNK_COLUMNS = 256
+ANALYTICS_POOL_MIN_CELLS = 2_000_000
+RETURN_HORIZONS = {
+    "1W": {"weeks": 1},
+    "1M": {"months": 1},
+    "3M": {"months": 3},
+    "YTD": None,
+    "1Y": {"years": 1},
+    "3Y": {"years": 3},
+}
+ROLLING_WINDOWS = (20, 60, 120)
+ROLLING_OVERLAYS = {
+    "None": None,
+    "Moving Average": "moving_average",
+    "Rolling Return": "rolling_return",
+    "Rolling Volatility": "volatility",
+}
+TRADING_DAYS_PER_YEAR = 252
+ROLLING_STATE_LIMIT = 32
+PRICE_SAMPLE_ROWS = 16
+PRICE_RESOLUTIONS = {
+    "Daily": (None, 365 / TRADING_DAYS_PER_YEAR),
+    "Weekly": ("W", 7),
+    "Monthly": ("M", 365 / 12),
+}
+CHART_PIXEL_WIDTH = 1200
+CHART_PIXELS_PER_POINT = 3
+CORRELATION_MIN_POINTS = 120
+CORRELATION_CHART_LIMIT = 60
+SCENARIO_CHART_TOP_N = 5
+QUALITY_GAP_BUSINESS_DAYS = 5
+QUALITY_JUMP_THRESHOLD = 0.4
+QUALITY_SPLIT_RATIOS = (2, 3, 4, 5, 10, 20, 25, 50)
+QUALITY_SPLIT_TOLERANCE = 0.05
 
 
 class TargetConfigError(RuntimeError):
     pass
 
 
-def load_target_records(file_path):
-    path = Path(file_path)
-    if not path.exists():
-        raise TargetConfigError(f"종목 설정 파일이 없습니다: {path.name}")
+def parse_quantity(value, location):
+    if value is None or value == "":
+        return 1
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, int):
+        return value
+
+    try:
+        return int(str(value).strip() or 1)
+    except ValueError as exc:
+        raise TargetConfigError(f"{location} 보유수량은 정수여야 합니다: {value}") from exc
+
 
+def parse_target_text_file(path):
     records = []
     for line_number, raw_line in enumerate(
         path.read_text(encoding="utf-8").splitlines(), start=1
@@ -97,32 +218,219 @@ def load_target_records(file_path):
             )
 
         quantity_text = parts[2] if len(parts) >= 3 else ""
-        if quantity_text == "":
-            quantity = 1
-        else:
-            try:
-                quantity = int(quantity_text)
-            except ValueError as exc:
-                raise TargetConfigError(
-                    f"{path.name}:{line_number} 보유수량은 정수여야 합니다: {quantity_text}"
-                ) from exc
-
+        quantity = parse_quantity(quantity_text, f"{path.name}:{line_number}")
         records.append({"code": parts[0], "name": parts[1], "quantity": quantity})
 
+    return records
+
+
+def resolve_universe_columns(header, path):
+    normalized = {str(column).strip().lower(): column for column in header}
+    columns = {
+        field: next(
+            (normalized[alias] for alias in aliases if alias in normalized), None
+        )
+        for field, aliases in UNIVERSE_COLUMN_ALIASES.items()
+    }
+    if columns["code"] is None:
+        raise TargetConfigError(
+            f"{path.name} 종목코드 컬럼이 없습니다 - {', '.join(UNIVERSE_COLUMN_ALIASES['code'])} 중 하나를 사용해 주세요."
+        )
+    return columns
+
+
+def build_universe_records(path, rows):
+    # Streams (row_number, code, name, quantity) tuples into compact records,
+    # keeping only the three fields the app uses and rejecting duplicate codes.
+    records = []
+    first_seen = {}
+    for row_number, code, name, quantity in rows:
+        code = "" if code is None else str(code).strip()
+        if not code:
+            continue
+
+        location = f"{path.name}:{row_number}"
+        if code in first_seen:
+            raise TargetConfigError(
+                f"{location} 중복 종목코드입니다: {code} (최초 위치: {first_seen[code]})"
+            )
+        first_seen[code] = location
+
+        name = code if name is None or str(name).strip() == "" else str(name).strip()
+        records.append(
+            {
+                "code": sys.intern(code),
+                "name": name,
+                "quantity": parse_quantity(quantity, location),
+            }
+        )
+
+    return records
+
+
+def parse_universe_csv(path):
+    with path.open(encoding="utf-8-sig", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return []
+
+        columns = resolve_universe_columns(header, path)
+        positions = {
+            field: header.index(column) if column is not None else None
+            for field, column in columns.items()
+        }
+
+        def field_value(row, field):
+            position = positions[field]
+            return row[position] if position is not None and position < len(row) else None
+
+        return build_universe_records(
+            path,
+            (
+                (
+                    row_number,
+                    field_value(row, "code"),
+                    field_value(row, "name"),
+                    field_value(row, "quantity"),
+                )
+                for row_number, row in enumerate(reader, start=2)
+            ),
+        )
+
+
+def parse_universe_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise TargetConfigError(
+            f"{path.name} Parquet 종목 목록을 읽으려면 pyarrow가 필요합니다."
+        ) from exc
+
+    parquet_file = pq.ParquetFile(path)
+    columns = resolve_universe_columns(parquet_file.schema_arrow.names, path)
+    selected = [column for column in columns.values() if column is not None]
+
+    def iter_rows():
+        row_number = 0
+        for batch in parquet_file.iter_batches(batch_size=UNIVERSE_BATCH_SIZE, columns=selected):
+            data = batch.to_pydict()
+            empty = [None] * batch.num_rows
+            yield from (
+                (row_number + offset + 1, code, name, quantity)
+                for offset, (code, name, quantity) in enumerate(
+                    zip(
+                        data[columns["code"]],
+                        data[columns["name"]] if columns["name"] is not None else empty,
+                        data[columns["quantity"]] if columns["quantity"] is not None else empty,
+                    )
+                )
+            )
+            row_number += batch.num_rows
+
+    return build_universe_records(path, iter_rows())
+
+
+def parse_target_file(path):
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return parse_universe_csv(path)
+    if suffix == ".parquet":
+        return parse_universe_parquet(path)
+    return parse_target_text_file(path)
+
+
+@cache_resource(show_spinner=False)
+def get_target_record_store():
+    return {}
+
+
+def load_target_records(file_path):
+    path = Path(file_path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise TargetConfigError(f"종목 설정 파일이 없습니다: {path.name}") from None
+
+    # Parsed records are reused until the file's mtime or size changes.
+    signature = (stat.st_mtime_ns, stat.st_size)
+    store = get_target_record_store()
+    cached = store.get(path.resolve())
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    records = parse_target_file(path)
     if not records:
         raise TargetConfigError(f"종목 설정 파일이 비어 있습니다: {path.name}")
 
+    store[path.resolve()] = (signature, records)
     return records
 
 
+def get_target_files():
+    target_files = dict(TARGET_FILES)
+    if UNIVERSE_DIR.is_dir():
+        for path in sorted(UNIVERSE_DIR.iterdir()):
+            if path.suffix.lower() in UNIVERSE_SUFFIXES:
+                target_files.setdefault(path.stem, path)
+    return target_files
+
+
+def get_target_files_signature():
+    signature = []
+    for category, path in get_target_files().items():
+        try:
+            stat = path.stat()
+            signature.append((category, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((category, None, None))
+    return tuple(signature)
+
+
+def merge_target_records(targets_by_category):
+    merged = {}
+    used_names = set()
+    for target_records in targets_by_category.values():
+        for target in target_records:
+            code = target["code"]
+            if code in merged:
+                merged[code]["quantity"] += target["quantity"]
+                continue
+
+            name = target["name"]
+            if name in used_names:
+                name = f"{name} ({code})"
+            used_names.add(name)
+            merged[code] = {**target, "name": name}
+
+    return list(merged.values())
+
+
+def with_all_holdings(targets_by_category):
+    holdings = {
+        category: targets_by_category[category]
+        for category in TARGET_FILES
+        if category in targets_by_category
+    }
+    return {
+        **holdings,
+        ALL_HOLDINGS_CATEGORY: merge_target_records(holdings),
+        **{
+            category: records
+            for category, records in targets_by_category.items()
+            if category not in holdings
+        },
+    }
+
+
 def load_all_targets():
     return {
         category: load_target_records(file_path)
-        for category, file_path in TARGET_FILES.items()
+        for category, file_path in get_target_files().items()
     }
 
 
-@st.cache_data(ttl=3600)
+@cache_data(ttl=3600)
 def get_latest_available_date(category_key, target_records, cache_version=CACHE_VERSION):
     if not target_records or getattr(fdr, "DataReader", None) is None:
         return date.today()
@@ -339,72 +647,339 @@ def configure_page() -> None:
     )
 
 
-@st.cache_data(ttl=3600)
-def fetch_stock_data(category_key, target_records, start_date, cache_version=CACHE_VERSION):
-    fetch_start = (
+def get_fetch_start(start_date):
+    return (
         datetime.combine(start_date, datetime.min.time()) - timedelta(days=15)
     ).strftime("%Y-%m-%d")
-    series_map = {}
 
-    def fetch_single(target):
-        code = target["code"]
-        name = target["name"]
+
+def clean_price_series(series):
+    # One-time ingest pass: sorted unique dates (the last published close for a
+    # date wins), non-positive closes masked out, and gaps, large jumps and
+    # likely unadjusted splits recorded instead of being guessed at later.
+    series = pd.to_numeric(series, errors="coerce").sort_index(kind="stable")
+    duplicated = series.index.duplicated(keep="last")
+    series = series[~duplicated]
+    non_positive = series <= 0
+    series = series.mask(non_positive)
+
+    valid = series.dropna()
+    values = valid.to_numpy(dtype=float)
+    dates = valid.index
+    ratios = values[1:] / values[:-1]
+    gap_days = np.busday_count(
+        dates[:-1].to_numpy().astype("datetime64[D]"),
+        dates[1:].to_numpy().astype("datetime64[D]"),
+    )
+
+    jumps = []
+    split_suspects = []
+    for position in np.flatnonzero(np.abs(ratios - 1) > QUALITY_JUMP_THRESHOLD):
+        ratio = ratios[position]
+        factor = 1 / ratio if ratio < 1 else ratio
+        split_ratio = next(
+            (
+                candidate
+                for candidate in QUALITY_SPLIT_RATIOS
+                if abs(factor / candidate - 1) <= QUALITY_SPLIT_TOLERANCE
+            ),
+            None,
+        )
+        # A jump that undoes, or is undone by, a neighbouring print is a bad
+        # tick, not a split.
+        reverted = any(
+            0 <= neighbour < len(ratios)
+            and abs(ratio * ratios[neighbour] - 1) <= QUALITY_JUMP_THRESHOLD / 2
+            for neighbour in (position - 1, position + 1)
+        )
+        date_text = dates[position + 1].strftime("%Y-%m-%d")
+        if split_ratio is not None and not reverted:
+            split_suspects.append(
+                {
+                    "date": date_text,
+                    "ratio": f"1:{split_ratio}" if ratio < 1 else f"{split_ratio}:1",
+                }
+            )
+        else:
+            jumps.append({"date": date_text, "change": float((ratio - 1) * 100)})
+
+    report = {
+        "rows": len(series),
+        "duplicates": int(duplicated.sum()),
+        "non_positive": series.index[non_positive.to_numpy()].strftime("%Y-%m-%d").tolist(),
+        "gaps": [
+            {
+                "start": dates[position].strftime("%Y-%m-%d"),
+                "end": dates[position + 1].strftime("%Y-%m-%d"),
+                "business_days": int(gap_days[position]),
+            }
+            for position in np.flatnonzero(gap_days > QUALITY_GAP_BUSINESS_DAYS)
+        ],
+        "jumps": jumps,
+        "split_suspects": split_suspects,
+    }
+    return series, report
+
+
+@cache_data(ttl=3600, show_spinner=False)
+def fetch_symbol_close(code, fetch_start, cache_version=CACHE_VERSION):
+    # Symbol-level cache shared by every category; fetch errors propagate so
+    # they are retried instead of being cached. The cleaned close is cached
+    # together with its quality report.
+    df = fdr.DataReader(code, fetch_start)
+    if df.empty:
+        return None
+    return clean_price_series(df["Close"])
+
+
+@cache_resource(show_spinner=False)
+def get_quality_report_store():
+    return {}
+
+
+def get_quality_reports(target_records):
+    store = get_quality_report_store()
+    return [
+        {"name": target["name"], "code": target["code"], **store[target["code"]]}
+        for target in target_records
+        if target["code"] in store
+    ]
+
+
+def assemble_price_frame(target_records, series_by_code):
+    series_map = {
+        target["name"]: series_by_code[target["code"]]
+        for target in target_records
+        if target["code"] in series_by_code
+    }
+    if not series_map:
+        return pd.DataFrame()
+
+    return pd.concat(series_map, axis=1, sort=True).sort_index()
+
+
+@cache_data(ttl=3600)
+def fetch_stock_data(category_key, target_records, start_date, cache_version=CACHE_VERSION):
+    fetch_start = get_fetch_start(start_date)
+    codes = list(dict.fromkeys(target["code"] for target in target_records))
+    series_by_code = {}
+
+    quality_store = get_quality_report_store()
+
+    def fetch_single(code):
         try:
-            df = fdr.DataReader(code, fetch_start)
-            if not df.empty:
-                return name, df["Close"]
+            return code, fetch_symbol_close(code, fetch_start)
         except Exception:
-            pass
-        return name, None
+            return code, None
+
+    def collect(code, fetched):
+        if fetched is not None:
+            series_by_code[code], quality_store[code] = fetched
 
-    with ThreadPoolExecutor(max_workers=min(30, max(1, len(target_records)))) as executor:
-        futures = {executor.submit(fetch_single, target): target["name"] for target in target_records}
+    with ThreadPoolExecutor(max_workers=min(30, max(1, len(codes)))) as executor:
+        futures = {executor.submit(fetch_single, code): code for code in codes}
         for future in as_completed(futures):
-            name, series = future.result()
-            if series is not None:
-                series_map[name] = series
+            collect(*future.result())
 
-    if not series_map:
-        for target in target_records:
-            name, series = fetch_single(target)
-            if series is not None:
-                series_map[name] = series
+    if not series_by_code:
+        for code in codes:
+            collect(*fetch_single(code))
+
+    return assemble_price_frame(target_records, series_by_code)
+
+@cache_data(ttl=3600, show_spinner=False)
+def fetch_latest_quotes(codes, time_bucket, cache_version=CACHE_VERSION):
+    # `time_bucket` changes once per polling interval, so every session polling
+    # the same symbols shares one short lookback request per symbol.
+    lookup_start = (date.today() - timedelta(days=INTRADAY_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+
+    def fetch_quote(code):
+        try:
+            close = fdr.DataReader(code, lookup_start)["Close"].dropna()
+        except Exception:
+            return code, None
+        if close.empty:
+            return code, None
+        return code, (close.index[-1].normalize(), float(close.iloc[-1]))
+
+    quotes = {}
+    with ThreadPoolExecutor(max_workers=min(30, max(1, len(codes)))) as executor:
+        for code, quote in executor.map(fetch_quote, codes):
+            if quote is not None:
+                quotes[code] = quote
+    return quotes
+
+
+def apply_latest_quotes(prices_df, target_records, quotes):
+    # Overwrites the last row in place for same-day quotes and appends one row
+    # for a new trading day; earlier rows are never touched.
+    if prices_df.empty:
+        return prices_df
+
+    last_date = prices_df.index[-1]
+    new_row = {}
+    for target in target_records:
+        name = target["name"]
+        quote = quotes.get(target["code"])
+        if quote is None or name not in prices_df.columns:
+            continue
+
+        quote_date, price = quote
+        if quote_date == last_date:
+            prices_df.iat[-1, prices_df.columns.get_loc(name)] = price
+        elif quote_date > last_date:
+            new_row.setdefault(quote_date, {})[name] = price
+
+    if new_row:
+        prices_df = pd.concat([prices_df, pd.DataFrame.from_dict(new_row, orient="index")])
+        prices_df = prices_df.sort_index()
+    return prices_df
+
+
+@cache_resource(show_spinner=False)
+def get_intraday_store():
+    return {"lock": threading.Lock(), "frames": {}}
+
+
+def refresh_intraday_prices(category_key, target_records, start_date, daily_prices, interval):
+    store = get_intraday_store()
+    state_key = (category_key, str(start_date))
+    daily_signature = (
+        len(daily_prices.index),
+        daily_prices.index[-1] if len(daily_prices.index) else None,
+        tuple(daily_prices.columns),
+    )
+    codes = tuple(dict.fromkeys(target["code"] for target in target_records))
+    quotes = fetch_latest_quotes(codes, int(time.time() // interval))
+
+    with store["lock"]:
+        frames = store["frames"]
+        signature, live_prices = frames.pop(state_key, (None, None))
+        if signature != daily_signature:
+            live_prices = daily_prices.copy()
+        live_prices = apply_latest_quotes(live_prices, target_records, quotes)
+        frames[state_key] = (daily_signature, live_prices)
+        while len(frames) > ROLLING_STATE_LIMIT:
+            frames.pop(next(iter(frames)))
+        # Other sessions patch the stored frame in place on their next poll.
+        return live_prices.copy()
+
+
+def infer_currency(code):
+    # KRX codes are six characters starting with a digit (005930, 0080G0);
+    # everything else FinanceDataReader serves here is USD-listed.
+    return "KRW" if len(code) == 6 and code[:1].isdigit() else "USD"
+
+
+def get_currency_map(target_records):
+    return {
+        target["name"]: target.get("currency") or infer_currency(target["code"])
+        for target in target_records
+    }
+
+
+def fetch_fx_rates(currencies, start_date):
+    fetch_start = get_fetch_start(start_date)
+    series_map = {}
+    for currency in sorted(set(currencies) - {BASE_CURRENCY}):
+        symbol = FX_SYMBOLS.get(currency, f"{currency}/{BASE_CURRENCY}")
+        try:
+            fetched = fetch_symbol_close(symbol, fetch_start)
+        except Exception:
+            continue
+        if fetched is not None:
+            series_map[currency] = fetched[0]
 
     if not series_map:
         return pd.DataFrame()
 
-    combined_df = pd.concat(series_map, axis=1, sort=True)
+    return pd.concat(series_map, axis=1, sort=True).sort_index()
+
 
-    ordered_cols = [target["name"] for target in target_records if target["name"] in combined_df.columns]
-    if ordered_cols:
-        combined_df = combined_df[ordered_cols]
+def align_fx_rates(fx_df, index):
+    # Last known rate on or before each price date (NaN before the first rate).
+    fx_df = fx_df[~fx_df.index.duplicated(keep="last")].sort_index().ffill()
+    positions = fx_df.index.searchsorted(index, side="right") - 1
+    rates = fx_df.to_numpy(dtype=float)[np.maximum(positions, 0)]
+    rates[positions < 0] = np.nan
+    return pd.DataFrame(rates, index=index, columns=fx_df.columns)
+
+
+def convert_prices_to_base(prices_df, currency_by_name, fx_df):
+    currencies = [currency_by_name.get(column, BASE_CURRENCY) for column in prices_df.columns]
+    if prices_df.empty or all(currency == BASE_CURRENCY for currency in currencies):
+        return prices_df
+
+    fx_columns = list(fx_df.columns)
+    rate_matrix = np.ones((len(prices_df), len(fx_columns) + 2))
+    rate_matrix[:, -1] = np.nan
+    if fx_columns:
+        rate_matrix[:, 1:-1] = align_fx_rates(fx_df, prices_df.index).to_numpy()
+
+    rate_positions = [
+        0
+        if currency == BASE_CURRENCY
+        else fx_columns.index(currency) + 1
+        if currency in fx_columns
+        else len(fx_columns) + 1
+        for currency in currencies
+    ]
+    converted = prices_df.to_numpy(dtype=float) * rate_matrix[:, rate_positions]
+    return pd.DataFrame(converted, index=prices_df.index, columns=prices_df.columns)
+
+
+def attach_fx_rates(summary, currency_by_name, fx_df):
+    enriched = []
+    for item in summary:
+        currency = currency_by_name.get(item["name"], BASE_CURRENCY)
+        fx_rate = 1.0
+        if currency != BASE_CURRENCY:
+            fx_series = fx_df[currency].dropna() if currency in fx_df.columns else None
+            fx_rate = (
+                float(fx_series.asof(pd.Timestamp(item["date"])))
+                if fx_series is not None and not fx_series.empty
+                else float("nan")
+            )
+        enriched.append({**item, "currency": currency, "fx_rate": fx_rate})
+    return enriched
+
+
+def find_missing_fx_holdings(summary):
+    # Holdings calculate_portfolio_weights drops because their currency has no
+    # rate, so callers can say the allocation is incomplete.
+    return [
+        {"name": item["name"], "currency": item["currency"]}
+        for item in summary
+        if item.get("currency", BASE_CURRENCY) != BASE_CURRENCY
+        and not item.get("fx_rate", 1.0) > 0
+    ]
 
-    return combined_df.sort_index()
 
 def slice_period_data(prices_df, start_date, end_date):
     if prices_df.empty:
         return pd.DataFrame()
 
+    if prices_df.index.is_monotonic_increasing:
+        # Ingested frames are sorted with unique dates, so the window is a
+        # positional slice instead of two full-index comparisons.
+        start_pos, end_pos = get_period_positions(prices_df.index, start_date, end_date)
+        return prices_df.iloc[start_pos:end_pos].copy()
+
     start_dt = pd.to_datetime(start_date)
     end_dt = pd.to_datetime(end_date)
     return prices_df[(prices_df.index >= start_dt) & (prices_df.index <= end_dt)].copy()
 
 
-def calculate_period_summary(prices_df, start_date, end_date, target_records=None):
-    df_period = slice_period_data(prices_df, start_date, end_date)
-    if df_period.empty:
-        return []
-
-    results = []
-    reference_base_date = (
-        df_period.dropna(how="all").index[0].normalize()
-        if not df_period.dropna(how="all").empty
-        else pd.to_datetime(start_date).normalize()
+def use_analytics_pool(df):
+    return (
+        (os.cpu_count() or 1) > 1
+        and df.shape[1] > ANALYTICS_CHUNK_COLUMNS
+        and df.size >= ANALYTICS_POOL_MIN_CELLS
     )
-    quantity_map = {
-        target["name"]: target["quantity"] for target in (target_records or [])
-    }
 
+
+def summarize_period_columns(df_period, reference_base_date, quantity_map):
+    results = []
     for name in df_period.columns:
         series = df_period[name].dropna()
         if series.empty:
@@ -432,51 +1007,529 @@ def calculate_period_summary(prices_df, start_date, end_date, target_records=Non
             }
         )
 
+    return results
+
+
+def calculate_period_summary(prices_df, start_date, end_date, target_records=None):
+    df_period = slice_period_data(prices_df, start_date, end_date)
+    if df_period.empty:
+        return []
+
+    reference_base_date = (
+        df_period.dropna(how="all").index[0].normalize()
+        if not df_period.dropna(how="all").empty
+        else pd.to_datetime(start_date).normalize()
+    )
+    quantity_map = {
+        target["name"]: target["quantity"] for target in (target_records or [])
+    }
+
+    if use_analytics_pool(df_period):
+        # Thousands of symbols: column chunks are summarized in worker processes
+        # so the script thread (and the GIL) stays free for other sessions.
+        from analytics_pool import run_period_summary
+
+        results = run_period_summary(df_period, reference_base_date, quantity_map)
+    else:
+        results = summarize_period_columns(df_period, reference_base_date, quantity_map)
+
     return sorted(results, key=lambda x: x["return"], reverse=True)
 
 
-def normalize_prices_for_chart(prices_df, visible_names, start_date, end_date):
+def calculate_horizon_returns(prices_df, as_of_date, horizons=None):
+    horizons = RETURN_HORIZONS if horizons is None else horizons
+    as_of = pd.to_datetime(as_of_date).normalize()
+    df_history = prices_df[prices_df.index <= as_of] if not prices_df.empty else prices_df
+    if df_history.empty:
+        return pd.DataFrame(columns=list(horizons))
+
+    values = df_history.to_numpy(dtype=float)
+    row_count, column_count = values.shape
+    # For every row/column, the row of the last valid price on or before that row.
+    valid_rows = np.where(~np.isnan(values), np.arange(row_count)[:, None], -1)
+    last_valid_rows = np.maximum.accumulate(valid_rows, axis=0)
+
+    anchors = pd.DatetimeIndex(
+        [
+            pd.Timestamp(as_of.year - 1, 12, 31)
+            if offset is None
+            else as_of - pd.DateOffset(**offset)
+            for offset in horizons.values()
+        ]
+    )
+    anchor_positions = df_history.index.searchsorted(anchors, side="right") - 1
+    base_rows = np.where(
+        anchor_positions[:, None] >= 0, last_valid_rows[np.maximum(anchor_positions, 0)], -1
+    )
+    current_rows = last_valid_rows[-1]
+    columns = np.arange(column_count)
+
+    current_prices = np.where(current_rows >= 0, values[current_rows, columns], np.nan)
+    base_prices = np.where(base_rows >= 0, values[base_rows, columns], np.nan)
+    base_prices[base_prices <= 0] = np.nan
+    returns = (current_prices / base_prices - 1) * 100
+
+    table = pd.DataFrame(returns.T, index=df_history.columns, columns=list(horizons))
+    return table[current_rows >= 0]
+
+
+def calculate_chart_stats(values, columns):
+    # Per-column min/max/last of a normalized matrix; fmin/fmax skip NaN
+    # without the all-NaN warnings of nanmin/nanmax.
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return pd.DataFrame(columns=["min", "max", "last"], index=pd.Index(columns), dtype=float)
+
+    valid = ~np.isnan(values)
+    last_rows = len(values) - 1 - valid[::-1].argmax(axis=0)
+    return pd.DataFrame(
+        {
+            "min": np.fmin.reduce(values, axis=0),
+            "max": np.fmax.reduce(values, axis=0),
+            "last": values[last_rows, np.arange(values.shape[1])],
+        },
+        index=pd.Index(columns),
+    )
+
+
+def normalize_prices_with_stats(prices_df, visible_names, start_date, end_date, base_prices_df=None):
+    # `base_prices_df` (the daily frame) supplies the base values when
+    # `prices_df` is a weekly/monthly level, so the chart rebases on the same
+    # first daily close as the cards.
     df_period = slice_period_data(prices_df, start_date, end_date)
     if df_period.empty:
-        return pd.DataFrame()
+        return pd.DataFrame(), calculate_chart_stats(np.empty((0, 0)), [])
 
-    actual_cols = [column for column in visible_names if column in df_period.columns]
+    actual_cols = [
+        column for column in dict.fromkeys(visible_names) if column in df_period.columns
+    ]
     if not actual_cols:
-        return pd.DataFrame(index=df_period.index)
+        return pd.DataFrame(index=df_period.index), calculate_chart_stats(np.empty((0, 0)), [])
+
+    # Base 100 from each column's first valid price, for the whole matrix at
+    # once; the chart statistics come from the same normalized array.
+    values = df_period[actual_cols].to_numpy(dtype=float)
+    base_matrix = values
+    if base_prices_df is not None:
+        # Coarse rows are daily rows of the same window, so this is never empty.
+        start_pos, end_pos = get_period_positions(base_prices_df.index, start_date, end_date)
+        base_matrix = base_prices_df.iloc[start_pos:end_pos][actual_cols].to_numpy(dtype=float)
+    base_valid = ~np.isnan(base_matrix)
+    base_values = base_matrix[base_valid.argmax(axis=0), np.arange(base_matrix.shape[1])]
+    keep = base_valid.any(axis=0) & ~np.isnan(values).all(axis=0) & (base_values != 0)
+    columns = [column for column, is_kept in zip(actual_cols, keep) if is_kept]
+    normalized = values[:, keep] / base_values[keep] * 100
+
+    return (
+        pd.DataFrame(normalized, index=df_period.index, columns=columns),
+        calculate_chart_stats(normalized, columns),
+    )
 
-    normalized = pd.DataFrame(index=df_period.index)
-    for column in actual_cols:
-        series = df_period[column]
-        valid_series = series.dropna()
-        if valid_series.empty:
-            continue
 
-        base_value = valid_series.iloc[0]
-        if pd.isna(base_value) or base_value == 0:
-            continue
+def normalize_prices_for_chart(prices_df, visible_names, start_date, end_date):
+    return normalize_prices_with_stats(prices_df, visible_names, start_date, end_date)[0]
+
+
+@cache_resource(show_spinner=False)
+def get_normalized_store():
+    return {}
+
+
+def get_normalized_chart_data(
+    category_key, resolution, prices_df, visible_names, start_date, end_date, base_prices_df=None
+):
+    # Reruns that only touch other widgets reuse the normalized frame and its
+    # stats. A changed index, column set, last row or sampled earlier row
+    # triggers a recompute.
+    store = get_normalized_store()
+    state_key = (category_key, resolution, str(start_date), str(end_date), tuple(visible_names))
+    state = store.pop(state_key, None)
+    # A copy: intraday mode patches the live frame's last row in place, and a
+    # view would change along with it.
+    last_row = np.array(prices_df.iloc[-1], dtype=float) if not prices_df.empty else None
+    if (
+        state is None
+        or not state["index"].equals(prices_df.index)
+        or not is_price_history_unchanged(state, prices_df)
+        or not np.array_equal(state["last_row"], last_row, equal_nan=True)
+    ):
+        norm_df, stats = normalize_prices_with_stats(
+            prices_df, visible_names, start_date, end_date, base_prices_df
+        )
+        state = {
+            "norm_df": norm_df,
+            "stats": stats,
+            "columns": list(prices_df.columns),
+            "index": prices_df.index,
+            "last_row": last_row,
+            "sample": sample_price_rows(prices_df, len(prices_df.index) - 1),
+        }
+
+    store[state_key] = state
+    while len(store) > ROLLING_STATE_LIMIT:
+        store.pop(next(iter(store)))
+    return state["norm_df"], state["stats"]
+
 
-        normalized[column] = (series / base_value) * 100
+def calculate_rolling_analytics(prices_df, window):
+    if use_analytics_pool(prices_df):
+        from analytics_pool import run_rolling_analytics
 
-    return normalized.dropna(axis=1, how="all")
+        return run_rolling_analytics(prices_df, window)
+    return compute_rolling_analytics(prices_df, window)
+
+
+def compute_rolling_analytics(prices_df, window):
+    daily_returns = prices_df / prices_df.shift(1) - 1
+    return {
+        "moving_average": prices_df.rolling(window).mean(),
+        "rolling_return": (prices_df / prices_df.shift(window) - 1) * 100,
+        "volatility": daily_returns.rolling(window).std()
+        * math.sqrt(TRADING_DAYS_PER_YEAR)
+        * 100,
+    }
+
+
+def sample_price_rows(prices_df, row_count, sample_rows=PRICE_SAMPLE_ROWS):
+    # Evenly spaced rows from the first `row_count` rows: a cheap fingerprint
+    # that changes when a refetch revises history (e.g. split adjustments).
+    positions = (
+        np.unique(np.linspace(0, row_count - 1, sample_rows).astype(int)) if row_count > 0 else []
+    )
+    return np.array(prices_df.iloc[positions], dtype=float)
+
+
+def is_price_history_unchanged(state, prices_df):
+    # True when `prices_df` only appends rows to the frame `state` was built
+    # from, or rewrites its last row; earlier sampled rows must be unchanged.
+    previous_index = state["index"]
+    return (
+        state["columns"] == list(prices_df.columns)
+        and len(previous_index) > 0
+        and len(prices_df.index) >= len(previous_index)
+        and prices_df.index[: len(previous_index)].equals(previous_index)
+        and np.array_equal(
+            state["sample"],
+            sample_price_rows(prices_df, len(previous_index) - 1),
+            equal_nan=True,
+        )
+    )
+
+
+def update_rolling_analytics(state, prices_df, window):
+    # Reuse the cached rolling frames when the new price frame only appends rows
+    # (or rewrites the last known row); just the tail plus `window` rows of
+    # context is recomputed.
+    previous_index = state["index"] if state is not None else None
+    if (
+        state is None
+        or state["window"] != window
+        or not is_price_history_unchanged(state, prices_df)
+    ):
+        analytics = calculate_rolling_analytics(prices_df, window)
+    else:
+        recompute_from = len(previous_index) - 1
+        context_start = max(0, recompute_from - window)
+        tail = calculate_rolling_analytics(prices_df.iloc[context_start:], window)
+        analytics = {
+            key: pd.concat(
+                [state[key].iloc[:recompute_from], frame.iloc[recompute_from - context_start :]]
+            )
+            for key, frame in tail.items()
+        }
+
+    return {
+        **analytics,
+        "window": window,
+        "columns": list(prices_df.columns),
+        "index": prices_df.index,
+        "sample": sample_price_rows(prices_df, len(prices_df.index) - 1),
+    }
+
+
+@cache_resource(show_spinner=False)
+def get_rolling_state_store():
+    return {}
+
+
+def get_rolling_analytics(category_key, start_date, prices_df, window):
+    store = get_rolling_state_store()
+    state_key = (category_key, str(start_date), window)
+    state = update_rolling_analytics(store.pop(state_key, None), prices_df, window)
+    store[state_key] = state
+    while len(store) > ROLLING_STATE_LIMIT:
+        store.pop(next(iter(store)))
+    return state
+
+
+def resample_last_valid(prices_df, period_freq):
+    # One row per week/month holding each symbol's last valid close in that
+    # bin, labelled with the bin's last trading date so daily frames can be
+    # reindexed onto it.
+    if prices_df.empty:
+        return prices_df
+
+    periods = prices_df.index.to_period(period_freq)
+    bin_ends = np.append(np.flatnonzero(periods[1:] != periods[:-1]), len(periods) - 1)
+    resampled = prices_df.groupby(periods, sort=False).last()
+    resampled.index = prices_df.index[bin_ends]
+    return resampled
+
+
+def build_window_level(prices_df, period_freq, start_date, end_date, level_df=None):
+    # Coarse rows for one window: its first daily row, then one row per bin.
+    # Bins wholly inside the window come from the stored level; the edge bins
+    # are resampled from the daily window so the last point is the last daily
+    # row on or before end_date.
+    window = slice_period_data(prices_df, start_date, end_date)
+    if window.empty:
+        return window
+
+    periods = window.index.to_period(period_freq)
+    if level_df is None:
+        binned = resample_last_valid(window, period_freq)
+    else:
+        level_periods = level_df.index.to_period(period_freq)
+        binned = pd.concat(
+            [
+                resample_last_valid(window[periods == periods[0]], period_freq),
+                level_df[(level_periods > periods[0]) & (level_periods < periods[-1])],
+                resample_last_valid(
+                    window[(periods == periods[-1]) & (periods != periods[0])], period_freq
+                ),
+            ]
+        )
+
+    level = pd.concat([window.iloc[:1], binned])
+    return level[~level.index.duplicated(keep="last")]
+
+
+def update_price_pyramid(state, prices_df):
+    # Same append-only reuse as the rolling state: only the last stored bin of
+    # each level (which may have been partial) is resampled again.
+    rebuild = state is None or not is_price_history_unchanged(state, prices_df)
+
+    levels = {}
+    for resolution, (period_freq, _) in PRICE_RESOLUTIONS.items():
+        if period_freq is None:
+            levels[resolution] = prices_df
+        elif rebuild or state[resolution].empty:
+            levels[resolution] = resample_last_valid(prices_df, period_freq)
+        else:
+            previous = state[resolution]
+            last_bin_start = previous.index[-1].to_period(period_freq).start_time
+            recompute_from = prices_df.index.searchsorted(last_bin_start)
+            levels[resolution] = pd.concat(
+                [
+                    previous.iloc[:-1],
+                    resample_last_valid(prices_df.iloc[recompute_from:], period_freq),
+                ]
+            )
+
+    return {
+        **levels,
+        "columns": list(prices_df.columns),
+        "index": prices_df.index,
+        "sample": sample_price_rows(prices_df, len(prices_df.index) - 1),
+    }
+
+
+@cache_resource(show_spinner=False)
+def get_price_pyramid_store():
+    return {}
+
+
+def get_price_pyramid(category_key, start_date, prices_df):
+    store = get_price_pyramid_store()
+    state_key = (category_key, str(start_date))
+    state = update_price_pyramid(store.pop(state_key, None), prices_df)
+    store[state_key] = state
+    while len(store) > ROLLING_STATE_LIMIT:
+        store.pop(next(iter(store)))
+    return state
+
+
+def get_window_prices(category_key, start_date, prices_df, resolution, end_date):
+    period_freq = PRICE_RESOLUTIONS[resolution][0]
+    if period_freq is None:
+        return prices_df
+    level_df = get_price_pyramid(category_key, start_date, prices_df)[resolution]
+    return build_window_level(prices_df, period_freq, start_date, end_date, level_df)
+
+
+def select_price_resolution(start_date, end_date, min_points=None):
+    # Coarsest level that still has at least `min_points` rows in the window;
+    # by default one point per CHART_PIXELS_PER_POINT of chart width.
+    if min_points is None:
+        min_points = CHART_PIXEL_WIDTH / CHART_PIXELS_PER_POINT
+    span_days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days + 1
+    for resolution, (_, days_per_point) in reversed(PRICE_RESOLUTIONS.items()):
+        if span_days / days_per_point >= min_points:
+            return resolution
+    return "Daily"
+
+
+def build_rolling_overlay(rolling_state, overlay_key, prices_df, visible_names, start_date, end_date):
+    overlay = slice_period_data(rolling_state[overlay_key], start_date, end_date)
+    columns = [column for column in visible_names if column in overlay.columns]
+    if overlay.empty or not columns:
+        return pd.DataFrame()
+
+    overlay = overlay[columns]
+    if overlay_key == "moving_average":
+        base_values = slice_period_data(prices_df, start_date, end_date)[columns].bfill().iloc[0]
+        overlay = overlay / base_values.where(base_values != 0) * 100
+
+    return overlay.dropna(axis=1, how="all")
+
+
+def get_period_positions(index, start_date, end_date):
+    return (
+        int(index.searchsorted(pd.to_datetime(start_date), side="left")),
+        int(index.searchsorted(pd.to_datetime(end_date), side="right")),
+    )
+
+
+def iter_price_chunks(prices_df, start_date, end_date, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Row slices of the cached (sorted) matrix; the window is never copied whole.
+    if prices_df.empty:
+        return
+    start_pos, end_pos = get_period_positions(prices_df.index, start_date, end_date)
+    for position in range(start_pos, end_pos, chunk_rows):
+        yield prices_df.iloc[position : min(position + chunk_rows, end_pos)].rename_axis("Date")
+
+
+def iter_normalized_chunks(prices_df, start_date, end_date, chunk_rows=EXPORT_CHUNK_ROWS):
+    if prices_df.empty:
+        return
+    # Each column's first valid price is found chunk by chunk, stopping once
+    # every column has one, so the window is still never materialized whole.
+    base_values = np.full(len(prices_df.columns), np.nan)
+    missing = np.ones(len(prices_df.columns), dtype=bool)
+    for chunk in iter_price_chunks(prices_df, start_date, end_date, chunk_rows):
+        values = chunk.to_numpy(dtype=float)[:, missing]
+        valid = ~np.isnan(values)
+        found = valid.any(axis=0)
+        positions = np.flatnonzero(missing)[found]
+        base_values[positions] = values[valid.argmax(axis=0), np.arange(values.shape[1])][found]
+        missing[positions] = False
+        if not missing.any():
+            break
+
+    keep = ~missing & (base_values > 0)
+    columns = prices_df.columns[keep]
+    base_values = base_values[keep]
+    for chunk in iter_price_chunks(prices_df, start_date, end_date, chunk_rows):
+        yield chunk[columns] / base_values * 100
+
+
+class ExportChunkSink(io.RawIOBase):
+    # Write-only file object that hands back whatever pyarrow wrote since the
+    # last drain, so Parquet/Arrow output can be emitted chunk by chunk.
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_export_bytes(frames, export_format):
+    if export_format == "csv":
+        for index, frame in enumerate(frames):
+            yield frame.to_csv(header=index == 0).encode("utf-8")
+        return
+
+    import pyarrow as pa
+
+    sink = ExportChunkSink()
+    writer = None
+    schema = None
+    for frame in frames:
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        if writer is None:
+            schema = table.schema
+            if export_format == "parquet":
+                import pyarrow.parquet as pq
+
+                writer = pq.ParquetWriter(sink, schema)
+            else:
+                writer = pa.ipc.new_stream(sink, schema)
+        writer.write_table(table.cast(schema))
+        yield sink.drain()
+
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def build_export_file(chunks):
+    # download_button reads deferred data into bytes anyway and rejects
+    # temporary-file objects, so the streamed chunks are joined here.
+    return b"".join(chunks)
 
 
 def render_pyecharts_chart(chart):
-    st_pyecharts(chart, height=chart.height, width=chart.width)
+    streamlit_echarts.st_pyecharts(chart, height=chart.height, width=chart.width)
 
 
-def get_axis_bounds(norm_df):
-    finite_values = pd.Series(norm_df.to_numpy().ravel()).dropna()
-    if finite_values.empty:
+def get_axis_bounds(norm_df, stats=None):
+    if stats is None:
+        stats = calculate_chart_stats(norm_df.to_numpy(dtype=float), norm_df.columns)
+    y_min = stats["min"].min()
+    y_max = stats["max"].max()
+    if pd.isna(y_min) or pd.isna(y_max):
         return 95, 105
 
-    y_min = float(finite_values.min())
-    y_max = float(finite_values.max())
+    y_min = float(y_min)
+    y_max = float(y_max)
     y_buffer = max((y_max - y_min) * 0.05, 2)
     final_min = min(y_min - y_buffer, 95)
     final_max = max(y_max + y_buffer, 105)
     return int(final_min // 10 * 10), int(final_max // 10 * 10 + 20)
 
 
+def build_chart_tooltip_formatter(stats):
+    # Tooltip lines add each series' window low/high from the precomputed
+    # stats, indexed by series position (the normalized series come first;
+    # overlay series have no range). A plain numeric array keeps the JS free
+    # of quotes that pyecharts would escape.
+    ranges = [
+        None if pd.isna(low) else [round(float(low), 2), round(float(high), 2)]
+        for low, high in zip(stats["min"], stats["max"])
+    ]
+    return pyecharts_utils.JsCode(
+        "function (params) {"
+        f"var ranges = {json.dumps(ranges)};"
+        "var lines = [params[0].axisValueLabel];"
+        "params.forEach(function (p) {"
+        "var value = Array.isArray(p.value) ? p.value[1] : p.value;"
+        "if (value === null || value === undefined || value === '') { return; }"
+        "var line = p.marker + p.seriesName + ': ' + Number(value).toFixed(2);"
+        "var range = ranges[p.seriesIndex];"
+        "if (range) { line += ' (최저 ' + range[0] + ' / 최고 ' + range[1] + ')'; }"
+        "lines.push(line);"
+        "});"
+        "return lines.join('<br/>');"
+        "}"
+    )
+
+
 def calculate_portfolio_weights(summary, visible_names=None):
     visible_set = set(visible_names) if visible_names is not None else None
     portfolio = []
@@ -485,8 +1538,8 @@ def calculate_portfolio_weights(summary, visible_names=None):
         if visible_set is not None and item["name"] not in visible_set:
             continue
 
-        market_value = item["current_price"] * item.get("quantity", 1)
-        if market_value <= 0:
+        market_value = item["current_price"] * item.get("quantity", 1) * item.get("fx_rate", 1.0)
+        if not market_value > 0:
             continue
 
         portfolio.append(
@@ -514,39 +1567,324 @@ def calculate_portfolio_weights(summary, visible_names=None):
     return sorted(weighted, key=lambda x: x["weight"], reverse=True)
 
 
-def render_metric_cards(summary):
+def generate_weight_scenarios(columns, count, seed=0):
+    columns = list(columns)
+    equal_weight = pd.DataFrame(
+        [[1 / len(columns)] * len(columns)], index=["Equal Weight"], columns=columns
+    )
+    if count <= 0:
+        return equal_weight
+
+    weights = np.random.default_rng(seed).dirichlet(np.ones(len(columns)), size=count)
+    random_weights = pd.DataFrame(
+        weights,
+        index=[f"Random {index + 1}" for index in range(count)],
+        columns=columns,
+    )
+    return pd.concat([equal_weight, random_weights])
+
+
+def weights_to_quantities(weights_df, prices_df, start_date, end_date, capital):
+    df_period = slice_period_data(prices_df, start_date, end_date)
+    columns = [column for column in weights_df.columns if column in df_period.columns]
+    if df_period.empty or not columns:
+        return pd.DataFrame(index=weights_df.index)
+
+    weights = weights_df[columns].fillna(0).clip(lower=0)
+    weights = weights.div(weights.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+    start_prices = df_period[columns].bfill().iloc[0]
+    start_prices = start_prices.where(start_prices > 0)
+    return (weights * (capital if capital > 0 else 100) / start_prices).fillna(0)
+
+
+def validate_scenario_upload(uploaded_df, reserved_names):
+    names = pd.Index(uploaded_df.index.astype(str))
+    reserved = sorted(set(names) & set(reserved_names))
+    if reserved:
+        raise ValueError(f"예약된 시나리오 이름은 사용할 수 없습니다: {', '.join(reserved)}")
+    duplicated = sorted(set(names[names.duplicated()]))
+    if duplicated:
+        raise ValueError(f"시나리오 이름이 중복되었습니다: {', '.join(duplicated)}")
+
+    values = uploaded_df.apply(pd.to_numeric, errors="coerce")
+    invalid = values.isna() & uploaded_df.notna()
+    if invalid.to_numpy().any():
+        rows, cols = np.nonzero(invalid.to_numpy())
+        cells = [f"{names[row]}/{uploaded_df.columns[col]}" for row, col in zip(rows, cols)]
+        raise ValueError(f"숫자가 아닌 값이 있습니다: {', '.join(cells)}")
+
+    values.index = names
+    return values
+
+
+def simulate_portfolio_scenarios(prices_df, quantity_df, start_date, end_date):
+    df_period = slice_period_data(prices_df, start_date, end_date)
+    columns = [column for column in quantity_df.columns if column in df_period.columns]
+    summary_columns = ["start_value", "final_value", "return", "max_drawdown"]
+    if df_period.empty or not columns or quantity_df.empty:
+        return pd.DataFrame(), pd.DataFrame(columns=summary_columns)
+
+    # Holdings carry their last price across gaps, and before their first price
+    # they are held as cash at that (cost) price, so a late listing does not
+    # show up as a jump in portfolio value.
+    price_matrix = df_period[columns].ffill().bfill().fillna(0.0).to_numpy(dtype=float)
+    quantities = quantity_df[columns].fillna(0).to_numpy(dtype=float)
+    values = price_matrix @ quantities.T
+
+    scenario_index = np.arange(values.shape[1])
+    has_value = values > 0
+    start_values = np.where(
+        has_value.any(axis=0), values[has_value.argmax(axis=0), scenario_index], np.nan
+    )
+    running_max = np.maximum.accumulate(values, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = np.where(running_max > 0, values / running_max - 1, 0.0)
+
+    values_df = pd.DataFrame(values, index=df_period.index, columns=quantity_df.index)
+    summary_df = pd.DataFrame(
+        {
+            "start_value": start_values,
+            "final_value": values[-1],
+            "return": (values[-1] / start_values - 1) * 100,
+            "max_drawdown": drawdowns.min(axis=0) * 100,
+        },
+        index=quantity_df.index,
+    )
+    return values_df, summary_df
+
+
+def calculate_daily_returns(prices_df):
+    values = prices_df.to_numpy(dtype=float)
+    if len(values) < 2:
+        return np.empty((0, values.shape[1]))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values[1:] / values[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
 
+
+def calculate_correlation_matrix(returns, min_periods=2, block_size=CORRELATION_BLOCK_SIZE):
+    # Pairwise-complete Pearson correlation: every pair only uses the rows where
+    # both symbols have a return, so late-start symbols keep their overlap with
+    # the rest. Work is done in column blocks to bound peak memory.
+    column_count = returns.shape[1]
+    valid = ~np.isnan(returns)
+    counts = valid.sum(axis=0)
+    means = np.divide(
+        np.nansum(returns, axis=0), counts, out=np.zeros(column_count), where=counts > 0
+    )
+    centered = np.where(valid, returns - means, 0.0)
+    squared = centered * centered
+    mask = valid.astype(float)
+
+    corr = np.full((column_count, column_count), np.nan)
+    for row_start in range(0, column_count, block_size):
+        rows = slice(row_start, row_start + block_size)
+        x, x_mask, x_squared = centered[:, rows], mask[:, rows], squared[:, rows]
+        for col_start in range(row_start, column_count, block_size):
+            cols = slice(col_start, col_start + block_size)
+            y, y_mask, y_squared = centered[:, cols], mask[:, cols], squared[:, cols]
+
+            pair_count = x_mask.T @ y_mask
+            sum_x = x.T @ y_mask
+            sum_y = x_mask.T @ y
+            with np.errstate(divide="ignore", invalid="ignore"):
+                covariance = x.T @ y - sum_x * sum_y / pair_count
+                variance_x = x_squared.T @ y_mask - sum_x**2 / pair_count
+                variance_y = x_mask.T @ y_squared - sum_y**2 / pair_count
+                block = covariance / np.sqrt(variance_x * variance_y)
+
+            block[(pair_count < min_periods) | ~(variance_x > 0) | ~(variance_y > 0)] = np.nan
+            block = np.clip(block, -1.0, 1.0)
+            corr[rows, cols] = block
+            corr[cols, rows] = block.T
+
+    return corr
+
+
+def cluster_correlation_order(corr):
+    # Average-linkage agglomerative clustering (nearest-neighbor chain) on the
+    # correlation distance sqrt((1 - rho) / 2); returns the dendrogram leaf order.
+    size = len(corr)
+    if size <= 2:
+        return list(range(size))
+
+    distance = np.sqrt(np.clip((1 - np.nan_to_num(corr, nan=0.0)) / 2, 0, None))
+    np.fill_diagonal(distance, np.inf)
+    cluster_sizes = np.ones(size)
+    members = {index: [index] for index in range(size)}
+    chain = []
+
+    while len(members) > 1:
+        if not chain:
+            chain.append(next(iter(members)))
+
+        current = chain[-1]
+        row = distance[current]
+        nearest = int(np.argmin(row))
+        if len(chain) > 1 and row[chain[-2]] <= row[nearest]:
+            nearest = chain[-2]
+
+        if len(chain) < 2 or nearest != chain[-2]:
+            chain.append(nearest)
+            continue
+
+        chain.pop()
+        chain.pop()
+        keep, drop = min(current, nearest), max(current, nearest)
+        total = cluster_sizes[keep] + cluster_sizes[drop]
+        merged = (
+            cluster_sizes[keep] * distance[keep] + cluster_sizes[drop] * distance[drop]
+        ) / total
+        distance[keep, :] = merged
+        distance[:, keep] = merged
+        distance[keep, keep] = np.inf
+        distance[drop, :] = np.inf
+        distance[:, drop] = np.inf
+        cluster_sizes[keep] = total
+        members[keep].extend(members.pop(drop))
+
+    return next(iter(members.values()))
+
+
+@cache_data(ttl=3600)
+def calculate_return_correlation(
+    prices_df, start_date, end_date, cluster=False, min_periods=2, cache_version=CACHE_VERSION
+):
+    df_period = slice_period_data(prices_df, start_date, end_date).dropna(axis=1, how="all")
+    if df_period.empty:
+        return pd.DataFrame()
+
+    corr = calculate_correlation_matrix(calculate_daily_returns(df_period), min_periods)
+    keep = ~np.isnan(np.diag(corr))
+    if not keep.any():
+        return pd.DataFrame()
+
+    corr = corr[np.ix_(keep, keep)]
+    labels = df_period.columns[keep]
+    if cluster:
+        order = cluster_correlation_order(corr)
+        corr = corr[np.ix_(order, order)]
+        labels = labels[order]
+
+    return pd.DataFrame(corr, index=labels, columns=labels)
+
+
+@lru_cache(maxsize=4096)
+def build_metric_card_html(name, current_price, period_return, base_date, is_visible):
+    state_class = "card-on" if is_visible else "card-off"
+    color_class = "delta-positive" if period_return >= 0 else "delta-negative"
+    prefix = "+" if period_return >= 0 else ""
+    safe_name = html.escape(name)
+    base_date_text = html.escape(base_date)
+    return (
+        f'<div class="metric-link">'
+        f'<div class="metric-card {state_class}">'
+        f'<div class="metric-label">{safe_name}</div>'
+        f'<div class="metric-value">{current_price:,.0f}</div>'
+        f'<div class="metric-delta {color_class}">{prefix}{period_return:.2f}%</div>'
+        f'<div class="metric-meta">비교기준일<br>{base_date_text}</div>'
+        f"</div></div>"
+    )
+
+
+def select_metric_cards(
+    summary,
+    mode="All",
+    query="",
+    top_n=METRIC_CARD_TOP_N,
+    page=1,
+    page_size=METRIC_CARD_PAGE_SIZE,
+):
+    query = query.strip().lower()
+    items = [item for item in summary if query in item["name"].lower()] if query else list(summary)
+    if mode == "Top N":
+        items = sorted(items, key=lambda item: item["return"], reverse=True)[:top_n]
+    elif mode == "Bottom N":
+        items = sorted(items, key=lambda item: item["return"])[:top_n]
+
+    page_count = max(1, math.ceil(len(items) / page_size))
+    page = min(max(1, page), page_count)
+    return items[(page - 1) * page_size : page * page_size], page_count, len(items)
+
+
+def render_metric_card_grid(items):
     card_html = ['<div class="metric-grid-area">']
-    for item in summary:
-        name = item["name"]
-        is_visible = st.session_state.visibility_map.get(name, True)
-        state_class = "card-on" if is_visible else "card-off"
-        color_class = "delta-positive" if item["return"] >= 0 else "delta-negative"
-        prefix = "+" if item["return"] >= 0 else ""
-        safe_name = html.escape(name)
-        base_date_text = html.escape(item["base_date"])
+    for item in items:
         card_html.append(
-            f'<div class="metric-link">'
-            f'<div class="metric-card {state_class}">'
-            f'<div class="metric-label">{safe_name}</div>'
-            f'<div class="metric-value">{item["current_price"]:,.0f}</div>'
-            f'<div class="metric-delta {color_class}">{prefix}{item["return"]:.2f}%</div>'
-            f'<div class="metric-meta">비교기준일<br>{base_date_text}</div>'
-            f"</div></div>"
+            build_metric_card_html(
+                item["name"],
+                item["current_price"],
+                item["return"],
+                item["base_date"],
+                st.session_state.visibility_map.get(item["name"], True),
+            )
         )
     card_html.append("</div>")
     st.markdown("".join(card_html), unsafe_allow_html=True)
 
 
-def build_chart(norm_df):
-    y_min, y_max = get_axis_bounds(norm_df)
+def reset_metric_card_page():
+    st.session_state["metric_card_page_input"] = 1
+
+
+def render_metric_cards(summary):
+    if len(summary) <= METRIC_CARD_PAGE_SIZE:
+        render_metric_card_grid(summary)
+        return
+
+    # Large lists get a paged/top-N grid inside a fragment, so paging or
+    # searching reruns and re-sends only the card grid instead of the whole page.
+    def render_card_browser():
+        col_mode, col_query, col_page = st.columns([2, 2, 1])
+        with col_mode:
+            mode = st.radio(
+                "Cards",
+                METRIC_CARD_MODES,
+                horizontal=True,
+                key="metric_card_mode_input",
+                on_change=reset_metric_card_page,
+            )
+        with col_query:
+            query = st.text_input(
+                "Search", key="metric_card_query_input", on_change=reset_metric_card_page
+            )
+        with col_page:
+            page = st.number_input("Page", min_value=1, step=1, key="metric_card_page_input")
+
+        items, page_count, match_count = select_metric_cards(summary, mode, query, page=int(page))
+        st.caption(
+            f"{match_count}개 중 {len(items)}개 표시 · 페이지 {min(int(page), page_count)}/{page_count}"
+        )
+        render_metric_card_grid(items)
+
+    st.fragment(render_card_browser)()
+
+
+def build_chart(norm_df, overlay_df=None, overlay_label="", overlay_secondary_axis=False, stats=None):
+    if stats is None:
+        stats = calculate_chart_stats(norm_df.to_numpy(dtype=float), norm_df.columns)
+    has_overlay = overlay_df is not None and not overlay_df.empty
+    if has_overlay:
+        overlay_df = overlay_df.reindex(norm_df.index)
+    y_min, y_max = get_axis_bounds(
+        norm_df,
+        pd.concat(
+            [stats, calculate_chart_stats(overlay_df.to_numpy(dtype=float), overlay_df.columns)]
+        )
+        if has_overlay and not overlay_secondary_axis
+        else stats,
+    )
 
     chart = (
-        Line(init_opts=opts.InitOpts(width="100%", height="550px"))
+        charts.Line(init_opts=opts.InitOpts(width="100%", height="550px"))
         .add_xaxis(norm_df.index.strftime("%Y-%m-%d").tolist())
     )
 
     for index, column in enumerate(norm_df.columns):
+        last_value = stats["last"].get(column)
+        end_label = column if pd.isna(last_value) else f"{column} {last_value - 100:+.1f}%"
         chart.add_yaxis(
             series_name=column,
             y_axis=norm_df[column].round(2).tolist(),
@@ -556,7 +1894,7 @@ def build_chart(norm_df):
             linestyle_opts=opts.LineStyleOpts(width=2),
             end_label_opts=opts.LabelOpts(
                 is_show=True,
-                formatter=column,
+                formatter=end_label,
                 position="right",
                 font_size=12,
                 font_weight="bold",
@@ -565,7 +1903,9 @@ def build_chart(norm_df):
         )
 
     chart.set_global_opts(
-        tooltip_opts=opts.TooltipOpts(trigger="axis"),
+        tooltip_opts=opts.TooltipOpts(
+            trigger="axis", formatter=build_chart_tooltip_formatter(stats)
+        ),
         legend_opts=opts.LegendOpts(pos_top="top"),
         datazoom_opts=[opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)],
         yaxis_opts=opts.AxisOpts(
@@ -590,11 +1930,41 @@ def build_chart(norm_df):
             linestyle_opts=opts.LineStyleOpts(color="#888", type_="dashed", width=1),
         )
     )
+
+    if has_overlay:
+        if overlay_secondary_axis:
+            chart.extend_axis(
+                yaxis=opts.AxisOpts(
+                    type_="value",
+                    name=overlay_label,
+                    position="right",
+                    splitline_opts=opts.SplitLineOpts(is_show=False),
+                    axislabel_opts=opts.LabelOpts(formatter="{value}%"),
+                )
+            )
+
+        color_index = {column: index for index, column in enumerate(norm_df.columns)}
+        for column in overlay_df.columns:
+            if column not in color_index:
+                continue
+            chart.add_yaxis(
+                series_name=f"{column} {overlay_label}",
+                y_axis=overlay_df[column].round(2).tolist(),
+                yaxis_index=1 if overlay_secondary_axis else 0,
+                is_symbol_show=False,
+                is_connect_nones=False,
+                label_opts=opts.LabelOpts(is_show=False),
+                linestyle_opts=opts.LineStyleOpts(
+                    width=1,
+                    type_="dashed",
+                    color=CHART_COLORS[color_index[column] % len(CHART_COLORS)],
+                ),
+            )
     return chart
 
 
 def build_portfolio_chart_legacy(portfolio_weights):
-    chart = Bar(
+    chart = charts.Bar(
         init_opts=opts.InitOpts(width="100%", height="220px"),
     )
     chart.add_xaxis(["Portfolio"])
@@ -653,7 +2023,7 @@ def build_portfolio_chart(portfolio_weights):
             }
         )
 
-    chart = TreeMap(
+    chart = charts.TreeMap(
         init_opts=opts.InitOpts(width="100%", height="320px"),
     )
     chart.add(
@@ -683,24 +2053,142 @@ def build_portfolio_chart(portfolio_weights):
     return chart
 
 
+def limit_correlation_labels(corr_df, preferred_names, limit=CORRELATION_CHART_LIMIT):
+    # The heatmap has one cell per pair, so large matrices are cut down to the
+    # first `limit` preferred symbols, kept in the matrix's (clustered) order.
+    if len(corr_df) <= limit:
+        return corr_df
+
+    chosen = set(
+        list(dict.fromkeys(name for name in preferred_names if name in corr_df.index))[:limit]
+    )
+    labels = [label for label in corr_df.index if label in chosen]
+    return corr_df.loc[labels, labels]
+
+
+def build_correlation_chart(corr_df):
+    labels = [str(label) for label in corr_df.columns]
+    values = corr_df.to_numpy()
+    data = [
+        [col, row, "-" if np.isnan(values[row, col]) else round(float(values[row, col]), 2)]
+        for row in range(len(labels))
+        for col in range(len(labels))
+    ]
+
+    chart = charts.HeatMap(
+        init_opts=opts.InitOpts(
+            width="100%", height=f"{min(max(360, 24 * len(labels)), 1200)}px"
+        ),
+    )
+    chart.add_xaxis(labels)
+    chart.add_yaxis(
+        series_name="Correlation",
+        yaxis_data=labels,
+        value=data,
+        label_opts=opts.LabelOpts(is_show=len(labels) <= 12, font_size=10),
+    )
+    chart.set_global_opts(
+        tooltip_opts=opts.TooltipOpts(trigger="item"),
+        legend_opts=opts.LegendOpts(is_show=False),
+        visualmap_opts=opts.VisualMapOpts(
+            min_=-1,
+            max_=1,
+            range_color=["#1e88e5", "#ffffff", "#eb4432"],
+            orient="horizontal",
+            pos_left="center",
+            pos_bottom="0",
+        ),
+        xaxis_opts=opts.AxisOpts(
+            type_="category", axislabel_opts=opts.LabelOpts(rotate=45, interval=0)
+        ),
+        yaxis_opts=opts.AxisOpts(type_="category", axislabel_opts=opts.LabelOpts(interval=0)),
+    )
+    return chart
+
+
+def render_performance_section(analysis_type, prices_df, summary, start_date, end_date):
+    render_metric_cards(summary)
+    st.markdown("---")
+
+    visible_names = [
+        item["name"]
+        for item in summary
+        if st.session_state.visibility_map.get(item["name"], True)
+    ]
+
+    if not visible_names:
+        st.info("최소 1개 이상의 종목을 선택해야 차트를 볼 수 있습니다.")
+    else:
+        st.subheader("Performance Trend (Base 100 from each symbol's first valid date)")
+
+        col_overlay, col_window = st.columns([3, 1])
+        with col_overlay:
+            overlay_choice = st.radio(
+                "Overlay",
+                list(ROLLING_OVERLAYS.keys()),
+                horizontal=True,
+                key="rolling_overlay_input",
+            )
+        with col_window:
+            rolling_window = st.selectbox(
+                "Window (trading days)", ROLLING_WINDOWS, key="rolling_window_input"
+            )
+
+        resolution = select_price_resolution(start_date, end_date)
+        norm_df, chart_stats = get_normalized_chart_data(
+            analysis_type,
+            resolution,
+            get_window_prices(analysis_type, start_date, prices_df, resolution, end_date),
+            visible_names,
+            start_date,
+            end_date,
+            base_prices_df=prices_df,
+        )
+        if resolution != "Daily":
+            st.caption(f"{resolution} 종가 기준 · {len(norm_df)}개 구간")
+        if not norm_df.empty:
+            overlay_key = ROLLING_OVERLAYS[overlay_choice]
+            overlay_df = None
+            if overlay_key is not None:
+                rolling_state = get_rolling_analytics(
+                    analysis_type, start_date, prices_df, rolling_window
+                )
+                overlay_df = build_rolling_overlay(
+                    rolling_state, overlay_key, prices_df, visible_names, start_date, end_date
+                )
+            chart = build_chart(
+                norm_df,
+                overlay_df,
+                overlay_label=f"{overlay_choice} ({rolling_window}D)",
+                overlay_secondary_axis=overlay_key in ("rolling_return", "volatility"),
+                stats=chart_stats,
+            )
+            render_pyecharts_chart(chart)
+        else:
+            st.warning("선택한 종목으로 그릴 수 있는 차트 데이터가 없습니다.")
+
+
+def watch_target_files(signature):
+    # Polls the target file signatures from a fragment and reruns the whole app
+    # when a file is edited, added or removed, so target changes hot-reload.
+    def check_target_files():
+        if get_target_files_signature() != signature:
+            st.rerun()
+
+    st.fragment(run_every=TARGET_WATCH_INTERVAL_SECONDS)(check_target_files)()
+
+
 def render_app():
-    if (
-        ui is None
-        or opts is None
-        or Line is None
-        or Bar is None
-        or TreeMap is None
-        or st_pyecharts is None
-        or getattr(fdr, "DataReader", None) is None
-    ):
+    if any(importlib.util.find_spec(name) is None for name in APP_DEPENDENCIES):
         raise RuntimeError(
             "앱 실행에 필요한 의존성이 없습니다. requirements.txt의 패키지를 먼저 설치해 주세요."
         )
 
     configure_page()
+    watch_target_files(get_target_files_signature())
 
     try:
-        targets_by_category = load_all_targets()
+        targets_by_category = with_all_holdings(load_all_targets())
     except TargetConfigError as exc:
         st.error(f"종목 설정을 불러오지 못했습니다: {exc}")
         return
@@ -724,7 +2212,7 @@ def render_app():
             "</p>",
             unsafe_allow_html=True,
         )
-        tabs = list(TARGET_FILES.keys())
+        tabs = list(targets_by_category.keys())
         analysis_type = ui.tabs(options=tabs, default_value=tabs[0], key="analysis_tabs")
 
     active_targets = targets_by_category[analysis_type]
@@ -758,10 +2246,22 @@ def render_app():
         st.session_state.visibility_map = {name: True for name in all_names}
 
     with st.spinner("Fetching market data..."):
-        daily_prices = fetch_stock_data(analysis_type, active_targets, start_date)
-        summary = calculate_period_summary(
-            daily_prices, start_date, end_date, active_targets
+        # One fetch covers both the selected period and the multi-horizon
+        # table; the period views get the same rows a fetch from start_date had.
+        history_prices = fetch_stock_data(
+            analysis_type, active_targets, min(start_date, date(end_date.year - 3, 1, 1))
+        )
+        daily_prices = history_prices.iloc[
+            history_prices.index.searchsorted(pd.Timestamp(get_fetch_start(start_date))) :
+        ]
+        currency_by_name = get_currency_map(active_targets)
+        fx_rates = fetch_fx_rates(currency_by_name.values(), start_date)
+        summary = attach_fx_rates(
+            calculate_period_summary(daily_prices, start_date, end_date, active_targets),
+            currency_by_name,
+            fx_rates,
         )
+        base_prices = convert_prices_to_base(daily_prices, currency_by_name, fx_rates)
 
     if latest_available_date < date.today():
         st.caption(
@@ -781,8 +2281,44 @@ def render_app():
     st.info(
         "선택 기간 시작일에 가격이 없는 종목은 최초 가격 확인일을 비교기준일로 자동 사용합니다."
     )
-    render_metric_cards(summary)
-    st.markdown("---")
+    col_intraday, col_interval = st.columns([3, 1])
+    with col_intraday:
+        intraday_mode = st.toggle(
+            "Intraday mode (최신 시세만 주기적으로 갱신)", key="intraday_mode_input"
+        )
+    with col_interval:
+        intraday_interval = st.selectbox(
+            "Refresh (seconds)",
+            INTRADAY_INTERVALS,
+            key="intraday_interval_input",
+            disabled=not intraday_mode,
+        )
+
+    if intraday_mode:
+        # Only the cards and the trend chart rerun on the interval; each poll
+        # fetches the latest quote per symbol and patches the last row in place.
+        def render_live_section():
+            live_prices = refresh_intraday_prices(
+                analysis_type, active_targets, start_date, daily_prices, intraday_interval
+            )
+            # latest_available_date is cached for an hour, so a window ending
+            # there is extended to a new trading day the quotes appended.
+            live_end_date = end_date
+            if end_date >= latest_available_date and not live_prices.empty:
+                live_end_date = max(end_date, live_prices.index[-1].date())
+            live_summary = attach_fx_rates(
+                calculate_period_summary(live_prices, start_date, live_end_date, active_targets),
+                currency_by_name,
+                fx_rates,
+            )
+            render_performance_section(
+                analysis_type, live_prices, live_summary, start_date, live_end_date
+            )
+            st.caption(f"Intraday refreshed: {datetime.now().strftime('%H:%M:%S')}")
+
+        st.fragment(run_every=intraday_interval)(render_live_section)()
+    else:
+        render_performance_section(analysis_type, daily_prices, summary, start_date, end_date)
 
     visible_names = [
         item["name"]
@@ -790,18 +2326,87 @@ def render_app():
         if st.session_state.visibility_map.get(item["name"], True)
     ]
     portfolio_weights = calculate_portfolio_weights(summary, visible_names)
+    missing_fx = find_missing_fx_holdings(summary)
+    if missing_fx:
+        st.warning(
+            "환율을 가져오지 못해 포트폴리오 비중에서 제외된 종목이 있습니다: "
+            + ", ".join(f"{item['name']} ({item['currency']})" for item in missing_fx)
+        )
 
-    if not visible_names:
-        st.info("최소 1개 이상의 종목을 선택해야 차트를 볼 수 있습니다.")
-    else:
-        st.subheader("Performance Trend (Base 100 from each symbol's first valid date)")
+    with st.expander("Multi-Horizon Returns"):
+        horizon_df = calculate_horizon_returns(history_prices, end_date)
+        if horizon_df.empty:
+            st.info("기간별 수익률을 계산할 데이터가 없습니다.")
+        else:
+            st.caption(f"{end_date.strftime('%Y-%m-%d')} 기준 기간별 수익률(%)")
+            st.dataframe(horizon_df.round(2), width="stretch")
 
-        norm_df = normalize_prices_for_chart(daily_prices, visible_names, start_date, end_date)
-        if not norm_df.empty:
-            chart = build_chart(norm_df)
-            render_pyecharts_chart(chart)
+    with st.expander("Return Correlation"):
+        cluster_order = st.toggle("계층적 군집 순서로 정렬", key="correlation_cluster_toggle")
+        correlation_resolution = select_price_resolution(
+            start_date, end_date, min_points=CORRELATION_MIN_POINTS
+        )
+        corr_df = calculate_return_correlation(
+            get_window_prices(
+                analysis_type, start_date, daily_prices, correlation_resolution, end_date
+            ),
+            start_date,
+            end_date,
+            cluster=cluster_order,
+        )
+        if correlation_resolution != "Daily":
+            st.caption(f"{correlation_resolution} 수익률 기준 상관계수")
+        if corr_df.empty:
+            st.info("선택한 기간에 상관계수를 계산할 수 있는 데이터가 부족합니다.")
         else:
-            st.warning("선택한 종목으로 그릴 수 있는 차트 데이터가 없습니다.")
+            chart_corr_df = limit_correlation_labels(
+                corr_df, [item["name"] for item in portfolio_weights] + visible_names
+            )
+            if len(chart_corr_df) < len(corr_df):
+                st.caption(
+                    f"{len(corr_df)}개 종목 중 선택 종목의 평가금액 상위 "
+                    f"{len(chart_corr_df)}개만 표시합니다. 전체 행렬은 다운로드하세요."
+                )
+                st.download_button(
+                    "Download full correlation matrix",
+                    data=lambda: corr_df.to_csv().encode("utf-8"),
+                    file_name=(
+                        f"{analysis_type}_correlation_{start_date:%Y%m%d}_{end_date:%Y%m%d}.csv"
+                    ),
+                    mime="text/csv",
+                    on_click="ignore",
+                    key="export_correlation_button",
+                )
+            if not chart_corr_df.empty:
+                render_pyecharts_chart(build_correlation_chart(chart_corr_df))
+
+    with st.expander("Data Quality"):
+        quality_rows = [
+            {
+                "종목명": report["name"],
+                "코드": report["code"],
+                "중복 일자": report["duplicates"],
+                "0 이하 가격": len(report["non_positive"]),
+                "데이터 공백": len(report["gaps"]),
+                "급등락": len(report["jumps"]),
+                "분할 의심": ", ".join(
+                    f"{item['date']} ({item['ratio']})" for item in report["split_suspects"]
+                ),
+            }
+            for report in get_quality_reports(active_targets)
+            if report["duplicates"]
+            or report["non_positive"]
+            or report["gaps"]
+            or report["jumps"]
+            or report["split_suspects"]
+        ]
+        if quality_rows:
+            st.caption(
+                "수집 시점에 중복 일자와 0 이하 가격은 정리되었고, 나머지 항목은 표시만 합니다."
+            )
+            st.dataframe(pd.DataFrame(quality_rows), width="stretch", hide_index=True)
+        else:
+            st.info("수집한 시세에서 품질 이상 징후가 발견되지 않았습니다.")
 
     with st.expander("View Raw Data Details"):
         summary_df = pd.DataFrame(summary).rename(
@@ -814,16 +2419,111 @@ def render_app():
                 "base_date": "비교기준일",
                 "is_delayed_start": "후발 시작 종목",
                 "quantity": "보유수량",
+                "currency": "통화",
+                "fx_rate": f"환율({BASE_CURRENCY})",
             }
         )
         st.dataframe(summary_df, width="stretch")
 
+        export_label = st.selectbox(
+            "Export format", list(EXPORT_FORMATS.keys()), key="export_format_input"
+        )
+        export_suffix, export_mime = EXPORT_FORMATS[export_label]
+        export_sources = {
+            "prices": lambda: iter_price_chunks(daily_prices, start_date, end_date),
+            "normalized": lambda: iter_normalized_chunks(daily_prices, start_date, end_date),
+            "summary": lambda: iter([summary_df.set_index("종목명")]),
+        }
+        export_columns = st.columns(len(export_sources))
+        for export_column, (export_name, frames) in zip(export_columns, export_sources.items()):
+            with export_column:
+                st.download_button(
+                    f"Download {export_name}",
+                    data=lambda frames=frames: build_export_file(
+                        iter_export_bytes(frames(), export_suffix)
+                    ),
+                    file_name=(
+                        f"{analysis_type}_{export_name}_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+                        f".{export_suffix}"
+                    ),
+                    mime=export_mime,
+                    on_click="ignore",
+                    key=f"export_{export_name}_button",
+                )
+
     if portfolio_weights:
         st.markdown("---")
         st.subheader("Current Portfolio Allocation")
         portfolio_chart = build_portfolio_chart(portfolio_weights)
         render_pyecharts_chart(portfolio_chart)
 
+    with st.expander("What-if Rebalancing"):
+        col_count, col_mode = st.columns([1, 1])
+        with col_count:
+            scenario_count = st.number_input(
+                "Random weight scenarios",
+                min_value=0,
+                max_value=2000,
+                value=200,
+                step=50,
+                key="scenario_count_input",
+            )
+        with col_mode:
+            upload_mode = st.radio(
+                "CSV 값 형식", ["Quantity", "Weight"], horizontal=True, key="scenario_mode_input"
+            )
+        uploaded_file = st.file_uploader(
+            "시나리오 CSV (행: 시나리오 이름, 열: 종목명)", type="csv", key="scenario_file_input"
+        )
+
+        current_quantities = pd.DataFrame(
+            [{item["name"]: item["quantity"] for item in summary}], index=["Current"]
+        )
+        _, current_summary = simulate_portfolio_scenarios(
+            base_prices, current_quantities, start_date, end_date
+        )
+        capital = current_summary["start_value"].fillna(0).iloc[0] if not current_summary.empty else 0
+        weight_scenarios = generate_weight_scenarios(current_quantities.columns, int(scenario_count))
+        quantity_scenarios = [current_quantities]
+
+        if uploaded_file is not None:
+            try:
+                uploaded_df = validate_scenario_upload(
+                    pd.read_csv(uploaded_file, index_col=0),
+                    ["Current", *weight_scenarios.index],
+                )
+            except ValueError as exc:
+                st.error(f"시나리오 CSV를 사용할 수 없습니다: {exc}")
+            else:
+                if upload_mode == "Weight":
+                    weight_scenarios = pd.concat([uploaded_df, weight_scenarios])
+                else:
+                    quantity_scenarios.append(uploaded_df)
+
+        quantity_scenarios.append(
+            weights_to_quantities(weight_scenarios, base_prices, start_date, end_date, capital)
+        )
+        values_df, scenario_summary = simulate_portfolio_scenarios(
+            base_prices,
+            pd.concat(quantity_scenarios).fillna(0),
+            start_date,
+            end_date,
+        )
+
+        if scenario_summary.empty:
+            st.info("시뮬레이션할 가격 데이터가 없습니다.")
+        else:
+            ranked = scenario_summary.sort_values("return", ascending=False)
+            best_names = [name for name in ranked.index if name != "Current"][:SCENARIO_CHART_TOP_N]
+            chart_values = values_df[["Current", *best_names]]
+            chart_df = (
+                chart_values.where(chart_values > 0)
+                / scenario_summary.loc[chart_values.columns, "start_value"]
+                * 100
+            )
+            render_pyecharts_chart(build_chart(chart_df.dropna(axis=1, how="all")))
+            st.dataframe(ranked.round(2), width="stretch")
+
     st.caption(
         f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
         "Source: FinanceDataReader"
@@ -0,0 +1,190 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app import (
+    build_chart,
+    build_portfolio_chart,
+    calculate_period_summary,
+    calculate_portfolio_weights,
+    get_axis_bounds,
+    normalize_prices_for_chart,
+    normalize_prices_with_stats,
+    slice_period_data,
+)
+
+
+BENCHMARK_SIZES = {
+    "quick": ((10, 1), (100, 5)),
+    "full": ((10, 1), (100, 5), (1000, 10), (5000, 30)),
+}
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmarks" / "baseline.json"
+REGRESSION_THRESHOLD = 0.25
+REGRESSION_MIN_SECONDS = 0.001
+CHART_VISIBLE_LIMIT = 50
+NAN_RATIO = 0.02
+LATE_START_RATIO = 0.2
+DELISTED_RATIO = 0.05
+
+
+def make_synthetic_prices(symbol_count, years, seed=0, end_date="2026-03-31"):
+    # Business-day random walks with the gaps seen in real data: scattered
+    # missing closes, symbols listed after the first row and a few that stop
+    # trading before the last row.
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end_date, periods=max(2, int(years * 252)))
+    row_count = len(index)
+
+    returns = rng.normal(0.0003, 0.02, size=(row_count, symbol_count))
+    values = 100 * rng.uniform(0.1, 10, size=symbol_count) * np.cumprod(1 + returns, axis=0)
+    values[rng.random(values.shape) < NAN_RATIO] = np.nan
+
+    late_start = rng.random(symbol_count) < LATE_START_RATIO
+    start_rows = np.where(late_start, rng.integers(1, row_count, size=symbol_count), 0)
+    delisted = rng.random(symbol_count) < DELISTED_RATIO
+    end_rows = np.where(
+        delisted, rng.integers(start_rows + 1, row_count + 1), row_count
+    )
+    rows = np.arange(row_count)[:, None]
+    values[(rows < start_rows) | (rows >= end_rows)] = np.nan
+
+    columns = [f"SYN{number:05d}" for number in range(symbol_count)]
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def make_synthetic_targets(columns, seed=0):
+    rng = np.random.default_rng(seed)
+    quantities = rng.integers(1, 500, size=len(columns))
+    return [
+        {"code": name, "name": name, "quantity": int(quantity)}
+        for name, quantity in zip(columns, quantities)
+    ]
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_benchmarks(sizes, repeat=5, seed=0):
+    results = {}
+    for symbol_count, years in sizes:
+        prices_df = make_synthetic_prices(symbol_count, years, seed)
+        target_records = make_synthetic_targets(prices_df.columns, seed)
+        end_date = prices_df.index[-1].date()
+        start_date = (prices_df.index[-1] - pd.DateOffset(years=years)).date()
+        visible_names = list(prices_df.columns[:CHART_VISIBLE_LIMIT])
+
+        summary = calculate_period_summary(prices_df, start_date, end_date, target_records)
+        weights = calculate_portfolio_weights(summary)
+        norm_df = normalize_prices_for_chart(prices_df, visible_names, start_date, end_date)
+        full_norm_df, full_stats = normalize_prices_with_stats(
+            prices_df, prices_df.columns, start_date, end_date
+        )
+
+        cases = {
+            "slice_period_data": lambda: slice_period_data(prices_df, start_date, end_date),
+            "calculate_period_summary": lambda: calculate_period_summary(
+                prices_df, start_date, end_date, target_records
+            ),
+            "normalize_prices_for_chart": lambda: normalize_prices_for_chart(
+                prices_df, prices_df.columns, start_date, end_date
+            ),
+            "get_axis_bounds": lambda: get_axis_bounds(full_norm_df, full_stats),
+            "calculate_portfolio_weights": lambda: calculate_portfolio_weights(summary),
+            "build_chart": lambda: build_chart(norm_df),
+            "build_portfolio_chart": lambda: build_portfolio_chart(weights),
+        }
+        for name, func in cases.items():
+            results[f"{name}@{symbol_count}x{years}y"] = time_call(func, repeat)
+
+    return results
+
+
+def find_regressions(results, baseline, threshold=REGRESSION_THRESHOLD):
+    regressions = []
+    for key, seconds in results.items():
+        baseline_seconds = baseline.get(key)
+        # Sub-millisecond cases swing by more than the threshold on timer noise
+        # alone, so a slowdown must also be larger than REGRESSION_MIN_SECONDS.
+        if (
+            baseline_seconds
+            and seconds > baseline_seconds * (1 + threshold)
+            and seconds - baseline_seconds > REGRESSION_MIN_SECONDS
+        ):
+            regressions.append(
+                {
+                    "case": key,
+                    "baseline": baseline_seconds,
+                    "current": seconds,
+                    "change": seconds / baseline_seconds - 1,
+                }
+            )
+    return sorted(regressions, key=lambda item: item["change"], reverse=True)
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def save_baseline(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 시세 데이터로 핵심 계산/차트 함수의 성능을 측정합니다.")
+    parser.add_argument("--preset", choices=BENCHMARK_SIZES, default="quick")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+    results = run_benchmarks(BENCHMARK_SIZES[args.preset], args.repeat)
+    baseline = load_baseline(args.baseline)
+    for key, seconds in results.items():
+        baseline_seconds = baseline.get(key)
+        change = f"{seconds / baseline_seconds - 1:+.0%}" if baseline_seconds else "-"
+        print(f"{key:<48} {seconds * 1000:>10.2f} ms  {change:>6}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for item in regressions:
+        print(
+            f"성능 저하: {item['case']} {item['baseline'] * 1000:.2f} ms -> "
+            f"{item['current'] * 1000:.2f} ms ({item['change']:+.0%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
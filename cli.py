@@ -0,0 +1,184 @@
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from app import (
+    ALL_HOLDINGS_CATEGORY,
+    attach_fx_rates,
+    RETURN_HORIZONS,
+    TargetConfigError,
+    calculate_period_summary,
+    calculate_portfolio_weights,
+    fetch_fx_rates,
+    fetch_stock_data,
+    find_missing_fx_holdings,
+    get_currency_map,
+    get_target_files,
+    load_all_targets,
+    with_all_holdings,
+)
+
+
+REPORT_FORMATS = ("csv", "json", "parquet")
+
+
+def parse_window(text, as_of):
+    if text in RETURN_HORIZONS:
+        offset = RETURN_HORIZONS[text]
+        if offset is None:
+            start = date(as_of.year, 1, 1)
+        else:
+            start = (pd.Timestamp(as_of) - pd.DateOffset(**offset)).date()
+        return text, start, as_of
+
+    try:
+        start_text, end_text = text.split(":")
+        start = date.fromisoformat(start_text)
+        end = date.fromisoformat(end_text)
+    except ValueError as exc:
+        raise ValueError(
+            f"기간 형식 오류 - 'YYYY-MM-DD:YYYY-MM-DD' 또는 {', '.join(RETURN_HORIZONS)} 중 하나를 사용해 주세요: {text}"
+        ) from exc
+
+    if start > end:
+        raise ValueError(f"시작일은 종료일보다 늦을 수 없습니다: {text}")
+
+    return text, start, end
+
+
+def build_report(targets_by_category, categories, windows):
+    fetch_start = min(start for _, start, _ in windows)
+
+    def fetch_category(category):
+        return fetch_stock_data(category, targets_by_category[category], fetch_start)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(categories))) as executor:
+        prices_by_category = dict(zip(categories, executor.map(fetch_category, categories)))
+
+    currency_by_name = {
+        category: get_currency_map(targets_by_category[category]) for category in categories
+    }
+    fx_rates = fetch_fx_rates(
+        {currency for currencies in currency_by_name.values() for currency in currencies.values()},
+        fetch_start,
+    )
+
+    summary_rows = []
+    weight_rows = []
+    for category in categories:
+        for label, start, end in windows:
+            summary = attach_fx_rates(
+                calculate_period_summary(
+                    prices_by_category[category], start, end, targets_by_category[category]
+                ),
+                currency_by_name[category],
+                fx_rates,
+            )
+            context = {
+                "category": category,
+                "window": label,
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+            }
+            excluded = {item["name"] for item in find_missing_fx_holdings(summary)}
+            summary_rows.extend(
+                {**context, **item, "excluded": item["name"] in excluded} for item in summary
+            )
+            weight_rows.extend(
+                {**context, **item} for item in calculate_portfolio_weights(summary)
+            )
+
+    return pd.DataFrame(summary_rows), pd.DataFrame(weight_rows)
+
+
+def write_report(tables, output_dir, formats):
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for name, df in tables.items():
+        for report_format in formats:
+            path = output_path / f"{name}.{report_format}"
+            if report_format == "csv":
+                df.to_csv(path, index=False, encoding="utf-8")
+            elif report_format == "json":
+                df.to_json(path, orient="records", force_ascii=False, indent=2)
+            else:
+                df.to_parquet(path, index=False)
+            written.append(path)
+
+    return written
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Streamlit 없이 종목 성과 요약과 포트폴리오 비중 리포트를 생성합니다."
+    )
+    parser.add_argument(
+        "--category",
+        action="append",
+        choices=[*get_target_files(), ALL_HOLDINGS_CATEGORY],
+        help=f"리포트 대상 카테고리 (반복 지정 가능, 기본값: {ALL_HOLDINGS_CATEGORY}를 제외한 전체)",
+    )
+    parser.add_argument(
+        "--window",
+        action="append",
+        help=f"'YYYY-MM-DD:YYYY-MM-DD' 또는 {'/'.join(RETURN_HORIZONS)} (반복 지정 가능, 기본값: YTD)",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=date.fromisoformat,
+        help="상대 기간(YTD, 1Y 등)의 기준일 (기본값: 오늘)",
+    )
+    parser.add_argument(
+        "--format",
+        action="append",
+        choices=REPORT_FORMATS,
+        help="출력 형식 (반복 지정 가능, 기본값: csv)",
+    )
+    parser.add_argument("--output-dir", default="reports", help="리포트 저장 경로")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    as_of = args.as_of or date.today()
+
+    try:
+        windows = [parse_window(text, as_of) for text in args.window or ["YTD"]]
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    try:
+        file_targets = load_all_targets()
+    except TargetConfigError as exc:
+        print(f"종목 설정을 불러오지 못했습니다: {exc}", file=sys.stderr)
+        return 1
+
+    targets_by_category = with_all_holdings(file_targets)
+    categories = list(dict.fromkeys(args.category or file_targets))
+    summary_df, weights_df = build_report(targets_by_category, categories, windows)
+    if not summary_df.empty and summary_df["excluded"].any():
+        excluded_names = ", ".join(dict.fromkeys(summary_df.loc[summary_df["excluded"], "name"]))
+        print(
+            f"환율을 가져오지 못해 비중에서 제외된 종목이 있습니다: {excluded_names}",
+            file=sys.stderr,
+        )
+    written = write_report(
+        {"summary": summary_df, "weights": weights_df},
+        args.output_dir,
+        list(dict.fromkeys(args.format or ["csv"])),
+    )
+    for path in written:
+        print(path)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+
+import numpy as np
+import pandas as pd
+
+from api_server import SummaryService, make_server
+
+
+DEFAULT_PATHS = (
+    "/summary?category=KR%20Stocks&window=YTD",
+    "/weights?category=US%20Stocks&window=1Y",
+    "/normalized?category=ETFs&window=3M",
+)
+
+
+class SyntheticSummaryService(SummaryService):
+    # Serves the real target lists with generated random-walk prices so the
+    # load test measures the server, not FinanceDataReader.
+    def get_prices(self, category, target_records, start):
+        index = pd.bdate_range(start, pd.Timestamp.today().normalize())
+        rng = np.random.default_rng(len(category))
+        returns = rng.normal(0.0003, 0.015, size=(len(index), len(target_records)))
+        prices_df = pd.DataFrame(
+            100 * np.cumprod(1 + returns, axis=0),
+            index=index,
+            columns=[target["name"] for target in target_records],
+        )
+        return prices_df, ({target["name"]: "KRW" for target in target_records}, pd.DataFrame())
+
+
+def run_load(base_url, paths, total_requests, concurrency, use_etag, use_gzip):
+    etags = {}
+    etag_lock = threading.Lock()
+
+    def send(request_number):
+        path = paths[request_number % len(paths)]
+        request = urllib.request.Request(base_url + path)
+        if use_gzip:
+            request.add_header("Accept-Encoding", "gzip")
+        if use_etag:
+            with etag_lock:
+                etag = etags.get(path)
+            if etag:
+                request.add_header("If-None-Match", etag)
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                body = response.read()
+                status = response.status
+                etag = response.headers.get("ETag")
+        except HTTPError as exc:
+            body = exc.read()
+            status = exc.code
+            etag = exc.headers.get("ETag")
+        elapsed = time.perf_counter() - started
+
+        if etag:
+            with etag_lock:
+                etags[path] = etag
+        return status, elapsed, len(body)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(total_requests)))
+    wall_time = time.perf_counter() - started
+
+    latencies = sorted(elapsed for _, elapsed, _ in results)
+    statuses = {}
+    for status, _, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def percentile(ratio):
+        return latencies[min(len(latencies) - 1, int(ratio * len(latencies)))] * 1000
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "wall_time_s": wall_time,
+        "throughput_rps": total_requests / wall_time if wall_time else float("inf"),
+        "latency_mean_ms": statistics.fmean(latencies) * 1000,
+        "latency_p50_ms": percentile(0.50),
+        "latency_p90_ms": percentile(0.90),
+        "latency_p99_ms": percentile(0.99),
+        "bytes": sum(size for _, _, size in results),
+        "statuses": statuses,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON API 서버 처리량 측정")
+    parser.add_argument("--url", help="실행 중인 서버 주소 (생략 시 합성 데이터로 내장 서버 실행)")
+    parser.add_argument("--path", action="append", help="요청 경로 (반복 지정 가능)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--etag", action="store_true", help="If-None-Match 재검증 요청 사용")
+    parser.add_argument("--gzip", action="store_true", help="Accept-Encoding: gzip 요청")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = make_server(port=0, service=SyntheticSummaryService())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        report = run_load(
+            base_url.rstrip("/"),
+            args.path or list(DEFAULT_PATHS),
+            args.requests,
+            args.concurrency,
+            args.etag,
+            args.gzip,
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import argparse
+import gc
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import app
+
+
+SESSION_COUNTS = (1, 2, 4, 8)
+SESSION_STEPS = 6
+SESSION_ACTIONS = ("switch_tab", "move_dates", "toggle_visibility", "change_overlay")
+LOAD_TEST_TAB_KEY = "load_test_tab"
+APP_SCRIPT = "import app\napp.render_app()\n"
+STUB_HISTORY_START = "2018-01-01"
+STUB_FX_SYMBOL_PRICE = 1300.0
+
+
+class StubDataReader:
+    # Stands in for fdr.DataReader: deterministic random-walk closes per code,
+    # an optional delay to mimic network latency, and a thread-safe call count.
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, code, start=None, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        index = pd.bdate_range(STUB_HISTORY_START, pd.Timestamp.today().normalize())
+        rng = np.random.default_rng(sum(code.encode("utf-8")))
+        base_price = STUB_FX_SYMBOL_PRICE if "/" in code else 100.0
+        closes = base_price * np.cumprod(1 + rng.normal(0.0003, 0.015, size=len(index)))
+        frame = pd.DataFrame({"Close": closes}, index=index)
+        return frame[frame.index >= pd.Timestamp(start)] if start else frame
+
+    def reset(self):
+        with self.lock:
+            self.calls = 0
+
+
+def select_tab(options, default_value, key):
+    # ui.tabs is a custom component AppTest cannot click, so sessions pick
+    # their category through session state instead.
+    value = app.st.session_state.get(LOAD_TEST_TAB_KEY, default_value)
+    return value if value in options else default_value
+
+
+def get_current_rss_mb():
+    # Current (not peak) resident set size, so each level's growth is measured
+    # from where the previous level left off. Linux only.
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def apply_session_action(at, action, rng, categories):
+    if action == "switch_tab":
+        at.session_state[LOAD_TEST_TAB_KEY] = rng.choice(categories)
+    elif action == "move_dates":
+        end_date = at.date_input(key="end_date_input").value
+        at.date_input(key="start_date_input").set_value(
+            end_date - timedelta(days=rng.randint(30, 3 * 365))
+        )
+    elif action == "toggle_visibility":
+        visibility_map = dict(at.session_state["visibility_map"])
+        name = rng.choice(sorted(visibility_map))
+        visibility_map[name] = not visibility_map[name]
+        at.session_state["visibility_map"] = visibility_map
+    elif action == "change_overlay":
+        overlay = at.radio(key="rolling_overlay_input")
+        overlay.set_value(rng.choice(overlay.options))
+
+
+def run_session(session_id, steps, categories, timeout=120):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    at = AppTest.from_string(APP_SCRIPT, default_timeout=timeout)
+    latencies = []
+    errors = []
+
+    for step in range(steps):
+        if step > 0:
+            try:
+                action = SESSION_ACTIONS[(session_id + step) % len(SESSION_ACTIONS)]
+                apply_session_action(at, action, rng, categories)
+            except (KeyError, ValueError) as exc:
+                # The previous rerun may have ended early (e.g. no data), so the
+                # widget this action targets is not on the page.
+                errors.append(f"{type(exc).__name__}: {exc}")
+                continue
+
+        started = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - started)
+        errors.extend(str(exception.value) for exception in at.exception)
+
+    return latencies, errors
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    return float(np.percentile(values, q))
+
+
+def run_level(session_count, steps, stub_reader, categories):
+    app.st.cache_data.clear()
+    app.st.cache_resource.clear()
+    stub_reader.reset()
+    gc.collect()
+    rss_before = get_current_rss_mb()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=session_count) as executor:
+        sessions = list(
+            executor.map(
+                lambda session_id: run_session(session_id, steps, categories),
+                range(session_count),
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for session_latencies, _ in sessions for latency in session_latencies]
+    errors = [error for _, session_errors in sessions for error in session_errors]
+    rss_after = get_current_rss_mb()
+    return {
+        "sessions": session_count,
+        "reruns": len(latencies),
+        "errors": errors,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=float("nan")),
+        "mean": statistics.fmean(latencies) if latencies else float("nan"),
+        "reruns_per_second": len(latencies) / elapsed if elapsed else float("nan"),
+        "fetches": stub_reader.calls,
+        "fetches_per_session": stub_reader.calls / session_count,
+        "rss_growth_mb": None if rss_before is None else rss_after - rss_before,
+    }
+
+
+def run_load_test(session_counts, steps=SESSION_STEPS, fetch_delay=0.0):
+    stub_reader = StubDataReader(fetch_delay)
+    categories = list(app.with_all_holdings(app.load_all_targets()))
+    # Cache lookups from fetch worker threads log a missing-context warning
+    # per call under AppTest, which would bury the report.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+
+    try:
+        with patch.object(app.fdr, "DataReader", stub_reader), patch.object(
+            app, "ui", SimpleNamespace(tabs=select_tab)
+        ):
+            return [
+                run_level(session_count, steps, stub_reader, categories)
+                for session_count in session_counts
+            ]
+    finally:
+        # Stub prices must not outlive the run in the process-wide caches.
+        app.st.cache_data.clear()
+        app.st.cache_resource.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AppTest로 render_app 동시 세션 부하를 걸고 재실행 지연시간, 메모리, 조회 횟수를 측정합니다."
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(SESSION_COUNTS))
+    parser.add_argument("--steps", type=int, default=SESSION_STEPS, help="세션당 재실행 횟수")
+    parser.add_argument(
+        "--fetch-delay", type=float, default=0.0, help="DataReader 호출마다 추가할 지연(초)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_load_test(args.sessions, args.steps, args.fetch_delay)
+    print(
+        f"{'sessions':>8} {'reruns':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+        f"{'rerun/s':>8} {'fetches':>8} {'/session':>8} {'rss MB':>7} {'errors':>6}"
+    )
+    for result in results:
+        rss = result["rss_growth_mb"]
+        print(
+            f"{result['sessions']:>8} {result['reruns']:>6} "
+            f"{result['p50'] * 1000:>8.0f} {result['p90'] * 1000:>8.0f} {result['p99'] * 1000:>8.0f} "
+            f"{result['reruns_per_second']:>8.2f} {result['fetches']:>8} "
+            f"{result['fetches_per_session']:>8.1f} "
+            f"{'-' if rss is None else f'{rss:.1f}':>7} {len(result['errors']):>6}"
+        )
+    for result in results:
+        for error in dict.fromkeys(result["errors"]):
+            print(f"[{result['sessions']} sessions] {error}", file=sys.stderr)
+
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import math
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pandas as pd
+
+import app
+from analytics_pool import SharedPriceBuffer, run_period_summary, run_rolling_analytics
+from benchmark_app import make_synthetic_prices
+
+
+class TestAnalyticsPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def setUp(self):
+        self.prices_df = make_synthetic_prices(600, 1, seed=3)
+
+    def test_shared_price_buffer_is_column_major(self):
+        with SharedPriceBuffer(self.prices_df.shape, self.prices_df.to_numpy()) as buffer:
+            self.assertTrue(buffer.array.flags.f_contiguous)
+            self.assertTrue(buffer.array[:, 10:20].flags.f_contiguous)
+            self.assertTrue(pd.DataFrame(buffer.array).equals(pd.DataFrame(self.prices_df.to_numpy())))
+
+    def test_period_summary_matches_inline_summary(self):
+        reference_base_date = self.prices_df.dropna(how="all").index[0].normalize()
+        quantity_map = {name: 3 for name in self.prices_df.columns[:5]}
+
+        pooled = run_period_summary(
+            self.prices_df, reference_base_date, quantity_map, executor=self.executor
+        )
+        inline = app.summarize_period_columns(self.prices_df, reference_base_date, quantity_map)
+
+        self.assertEqual(pooled, inline)
+        self.assertTrue(any(item["is_delayed_start"] for item in pooled))
+
+    def test_rolling_analytics_matches_inline_frames(self):
+        pooled = run_rolling_analytics(self.prices_df, 20, executor=self.executor)
+        inline = app.compute_rolling_analytics(self.prices_df, 20)
+
+        self.assertEqual(set(pooled), set(inline))
+        for key, frame in inline.items():
+            pd.testing.assert_frame_equal(pooled[key], frame)
+
+    @patch("analytics_pool.reset_analytics_pool")
+    def test_pool_broken_while_idle_falls_back_inline(self, mock_reset):
+        executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.addCleanup(executor.shutdown)
+        executor.submit(math.sqrt, 4).result()
+        for process in list(executor._processes.values()):
+            process.kill()
+            process.join()
+        with self.assertRaises(BrokenProcessPool):
+            executor.submit(math.sqrt, 4).result()
+
+        reference_base_date = self.prices_df.dropna(how="all").index[0].normalize()
+        summary = run_period_summary(self.prices_df, reference_base_date, {}, executor=executor)
+        rolling = run_rolling_analytics(self.prices_df, 20, executor=executor)
+
+        self.assertEqual(
+            summary, app.summarize_period_columns(self.prices_df, reference_base_date, {})
+        )
+        pd.testing.assert_frame_equal(
+            rolling["volatility"], app.compute_rolling_analytics(self.prices_df, 20)["volatility"]
+        )
+        self.assertEqual(mock_reset.call_count, 2)
+
+    @patch("app.os.cpu_count", return_value=4)
+    def test_calculate_period_summary_dispatches_large_frames_to_pool(self, _):
+        with patch("app.ANALYTICS_POOL_MIN_CELLS", 1000), patch.object(
+            self.executor, "submit", wraps=self.executor.submit
+        ) as mock_submit, patch("analytics_pool.get_analytics_pool", return_value=self.executor):
+            self.assertTrue(app.use_analytics_pool(self.prices_df))
+            summary = app.calculate_period_summary(
+                self.prices_df, self.prices_df.index[0], self.prices_df.index[-1]
+            )
+
+        self.assertEqual(
+            mock_submit.call_count,
+            math.ceil(self.prices_df.shape[1] / app.ANALYTICS_CHUNK_COLUMNS),
+        )
+        self.assertEqual(len(summary), self.prices_df.notna().any().sum())
+        self.assertEqual(
+            [item["return"] for item in summary],
+            sorted((item["return"] for item in summary), reverse=True),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
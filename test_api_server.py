@@ -0,0 +1,166 @@
+import gzip
+import json
+import threading
+import unittest
+import urllib.request
+from datetime import date, timedelta
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+import pandas as pd
+
+from api_server import PRICE_CACHE_SIZE, SummaryService, make_server
+
+
+class TestApiServer(unittest.TestCase):
+    def setUp(self):
+        targets_patcher = patch(
+            "api_server.load_all_targets",
+            return_value={
+                "ETFs": [
+                    {"code": "API-A", "name": "API ETF A", "quantity": 2},
+                    {"code": "API-B", "name": "API ETF B", "quantity": 1},
+                ]
+            },
+        )
+        reader_patcher = patch("app.fdr.DataReader", side_effect=self.read_prices)
+        targets_patcher.start()
+        self.mock_reader = reader_patcher.start()
+        self.addCleanup(targets_patcher.stop)
+        self.addCleanup(reader_patcher.stop)
+
+        self.server = make_server(port=0, service=SummaryService())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @staticmethod
+    def read_prices(code, fetch_start):
+        dates = pd.bdate_range("2026-01-02", periods=300)
+        closes = {"API-A": 100.0, "API-B": 50.0}
+        return pd.DataFrame(
+            {"Close": [closes.get(code, 1.0) + index for index in range(len(dates))]},
+            index=dates,
+        )
+
+    def request(self, path, headers=None):
+        request = urllib.request.Request(self.base_url + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as exc:
+            return exc.code, exc.headers, exc.read()
+
+    def test_summary_supports_etag_revalidation_and_result_cache(self):
+        path = "/summary?category=ETFs&window=2026-01-02:2026-01-09"
+
+        status, headers, body = self.request(path)
+        fetch_count = self.mock_reader.call_count
+        cached_status, _, _ = self.request(
+            path, {"If-None-Match": headers["ETag"]}
+        )
+
+        payload = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(cached_status, 304)
+        self.assertEqual(self.mock_reader.call_count, fetch_count)
+        self.assertEqual(payload["summary"][0]["name"], "API ETF B")
+        self.assertAlmostEqual(payload["summary"][0]["return"], 10.0)
+
+    def test_normalized_series_are_gzipped_when_requested(self):
+        status, headers, body = self.request(
+            "/normalized?category=ETFs&window=2025-06-01:2027-12-31&names=API%20ETF%20A",
+            {"Accept-Encoding": "gzip"},
+        )
+
+        payload = json.loads(gzip.decompress(body))
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(list(payload["series"]), ["API ETF A"])
+        self.assertEqual(payload["series"]["API ETF A"][0], 100.0)
+        self.assertEqual(len(payload["dates"]), 300)
+
+    def test_normalized_series_use_coarser_resolution_for_narrow_width(self):
+        status, _, body = self.request(
+            "/normalized?category=ETFs&window=2026-01-02:2027-02-24&width=150"
+        )
+
+        payload = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["resolution"], "Weekly")
+        self.assertEqual(len(payload["dates"]), 61)
+        self.assertEqual(payload["dates"][0], "2026-01-02")
+        self.assertEqual(payload["dates"][-1], "2027-02-24")
+        self.assertEqual(payload["series"]["API ETF A"][-1], (100.0 + 298) / 100.0 * 100)
+
+    def test_weights_and_errors(self):
+        status, _, body = self.request("/weights?category=ETFs&window=2026-01-02:2026-01-02")
+        missing_status, _, missing_body = self.request("/summary?category=Unknown")
+        invalid_status, _, _ = self.request("/summary?category=ETFs&window=bad")
+
+        weights = json.loads(body)["weights"]
+        self.assertEqual(status, 200)
+        self.assertEqual([item["name"] for item in weights], ["API ETF A", "API ETF B"])
+        self.assertAlmostEqual(weights[0]["weight"], 80.0)
+        self.assertEqual(missing_status, 404)
+        self.assertIn("error", json.loads(missing_body))
+        self.assertEqual(invalid_status, 400)
+
+    def test_weights_list_holdings_excluded_for_missing_fx_rate(self):
+        def read_without_fx(code, fetch_start):
+            if "/" in code:
+                raise ConnectionError("fx unavailable")
+            return self.read_prices(code, fetch_start)
+
+        self.mock_reader.side_effect = read_without_fx
+        status, _, body = self.request("/weights?category=ETFs&window=2026-03-02:2026-03-06")
+
+        payload = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["weights"], [])
+        self.assertEqual(
+            sorted(item["name"] for item in payload["excluded"]), ["API ETF A", "API ETF B"]
+        )
+
+    @patch("api_server.traceback.print_exc")
+    @patch.object(SummaryService, "build_payload", side_effect=RuntimeError("boom"))
+    def test_unexpected_errors_return_json_500(self, mock_build, mock_print):
+        status, _, body = self.request("/summary?category=ETFs")
+
+        self.assertEqual(status, 500)
+        self.assertIn("error", json.loads(body))
+        mock_print.assert_called_once()
+
+    def test_price_cache_is_bounded_and_drops_expired_entries(self):
+        service = SummaryService(price_ttl=60)
+        records = [{"code": "API-A", "name": "API ETF A", "quantity": 1}]
+        with patch("api_server.time.monotonic", return_value=1000.0):
+            for day in range(PRICE_CACHE_SIZE + 5):
+                service.get_prices("ETFs", records, date(2026, 1, 1) + timedelta(days=day))
+        self.assertEqual(len(service.prices), PRICE_CACHE_SIZE)
+
+        with patch("api_server.time.monotonic", return_value=1100.0):
+            service.get_prices("ETFs", records, date(2026, 6, 1))
+        self.assertEqual(len(service.prices), 1)
+
+    def test_export_streams_chunked_csv(self):
+        status, headers, body = self.request(
+            "/export?category=ETFs&window=2026-01-02:2026-01-06&table=prices&format=csv"
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(
+            body.decode("utf-8").splitlines(),
+            [
+                "Date,API ETF A,API ETF B",
+                "2026-01-02,100.0,50.0",
+                "2026-01-05,101.0,51.0",
+                "2026-01-06,102.0,52.0",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,21 +1,65 @@
+import io
+import subprocess
+import sys
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 
 from app import (
+    apply_latest_quotes,
+    attach_fx_rates,
     build_chart,
+    build_export_file,
+    build_window_level,
+    build_correlation_chart,
+    build_metric_card_html,
     build_portfolio_chart,
+    calculate_correlation_matrix,
+    calculate_daily_returns,
+    calculate_horizon_returns,
     calculate_portfolio_weights,
     TargetConfigError,
     calculate_period_summary,
+    calculate_return_correlation,
+    convert_prices_to_base,
+    calculate_rolling_analytics,
+    clean_price_series,
+    cluster_correlation_order,
+    fetch_latest_quotes,
     fetch_stock_data,
+    find_missing_fx_holdings,
+    generate_weight_scenarios,
+    iter_export_bytes,
+    iter_normalized_chunks,
+    iter_price_chunks,
+    limit_correlation_labels,
+    get_currency_map,
+    get_intraday_store,
+    get_quality_reports,
+    load_all_targets,
     load_target_records,
+    merge_target_records,
+    refresh_intraday_prices,
+    select_metric_cards,
+    get_axis_bounds,
+    get_normalized_chart_data,
     normalize_prices_for_chart,
+    normalize_prices_with_stats,
+    resample_last_valid,
+    select_price_resolution,
+    update_price_pyramid,
+    simulate_portfolio_scenarios,
+    update_rolling_analytics,
+    validate_scenario_upload,
+    weights_to_quantities,
 )
 
+IMPORT_TIME_BUDGET_SECONDS = 0.3
+
 
 class TestApp(unittest.TestCase):
     @patch("app.fdr.DataReader")
@@ -78,6 +122,152 @@ class TestApp(unittest.TestCase):
         self.assertTrue(pd.isna(result.loc[pd.Timestamp("2026-03-07"), "후행 ETF"]))
         self.assertAlmostEqual(result.loc[pd.Timestamp("2026-03-10"), "후행 ETF"], 50.0)
 
+    @patch("app.fdr.DataReader")
+    def test_fetch_stock_data_fetches_each_code_once(self, mock_reader):
+        mock_reader.return_value = pd.DataFrame(
+            {"Close": [100, 110]},
+            index=pd.to_datetime(["2026-01-02", "2026-01-05"]),
+        )
+
+        result = fetch_stock_data(
+            "All Holdings",
+            [
+                {"code": "DEDUP-A", "name": "종목 A", "quantity": 1},
+                {"code": "DEDUP-B", "name": "종목 B", "quantity": 1},
+                {"code": "DEDUP-A", "name": "종목 A (ETF 계좌)", "quantity": 2},
+            ],
+            pd.Timestamp("2026-01-02").date(),
+        )
+
+        self.assertEqual(sorted(call.args[0] for call in mock_reader.call_args_list), ["DEDUP-A", "DEDUP-B"])
+        self.assertEqual(result.columns.tolist(), ["종목 A", "종목 B", "종목 A (ETF 계좌)"])
+
+    @patch("app.fdr.DataReader")
+    def test_fetch_stock_data_cleans_series_and_stores_quality_report(self, mock_reader):
+        mock_reader.return_value = pd.DataFrame(
+            {"Close": [110, 100, 105, 0]},
+            index=pd.to_datetime(["2026-01-05", "2026-01-02", "2026-01-05", "2026-01-06"]),
+        )
+        target_stocks = [{"code": "QUALITY-A", "name": "품질 A", "quantity": 1}]
+
+        result = fetch_stock_data("KR Stocks", target_stocks, pd.Timestamp("2026-01-02").date())
+        reports = get_quality_reports(target_stocks)
+
+        self.assertEqual(result.index.strftime("%Y-%m-%d").tolist(), ["2026-01-02", "2026-01-05", "2026-01-06"])
+        self.assertEqual(result["품질 A"].iloc[1], 105)
+        self.assertTrue(pd.isna(result["품질 A"].iloc[2]))
+        self.assertEqual(reports[0]["name"], "품질 A")
+        self.assertEqual(reports[0]["duplicates"], 1)
+        self.assertEqual(reports[0]["non_positive"], ["2026-01-06"])
+
+    def test_clean_price_series_flags_gaps_jumps_and_split_suspects(self):
+        dates = pd.to_datetime(
+            ["2026-01-02", "2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08", "2026-01-26", "2026-01-27"]
+        )
+        series = pd.Series([100.0, 200.0, 101.0, 50.5, -1.0, 51.0, 52.0], index=dates)
+
+        cleaned, report = clean_price_series(series)
+
+        self.assertTrue(pd.isna(cleaned.loc["2026-01-08"]))
+        self.assertEqual(report["rows"], 7)
+        self.assertEqual(report["non_positive"], ["2026-01-08"])
+        self.assertEqual(
+            report["gaps"], [{"start": "2026-01-07", "end": "2026-01-26", "business_days": 13}]
+        )
+        self.assertEqual([item["date"] for item in report["jumps"]], ["2026-01-05", "2026-01-06"])
+        self.assertEqual(report["split_suspects"], [{"date": "2026-01-07", "ratio": "1:2"}])
+
+    def test_merge_target_records_combines_categories_by_code(self):
+        merged = merge_target_records(
+            {
+                "KR Stocks": [
+                    {"code": "005930", "name": "삼성전자", "quantity": 2},
+                    {"code": "000660", "name": "SK하이닉스", "quantity": 1},
+                ],
+                "ETFs": [
+                    {"code": "005930", "name": "Samsung", "quantity": 3},
+                    {"code": "069500", "name": "SK하이닉스", "quantity": 4},
+                ],
+            }
+        )
+
+        self.assertEqual(
+            merged,
+            [
+                {"code": "005930", "name": "삼성전자", "quantity": 5},
+                {"code": "000660", "name": "SK하이닉스", "quantity": 1},
+                {"code": "069500", "name": "SK하이닉스 (069500)", "quantity": 4},
+            ],
+        )
+
+    @patch("app.fdr.DataReader")
+    def test_fetch_latest_quotes_returns_last_valid_close_per_code(self, mock_reader):
+        mock_reader.return_value = pd.DataFrame(
+            {"Close": [100.0, 101.5, None]},
+            index=pd.to_datetime(["2026-03-09 00:00", "2026-03-10 15:30", "2026-03-11 00:00"]),
+        )
+
+        quotes = fetch_latest_quotes(("QUOTE-A",), 1)
+
+        self.assertEqual(quotes, {"QUOTE-A": (pd.Timestamp("2026-03-10"), 101.5)})
+
+    def test_apply_latest_quotes_overwrites_last_row_or_appends_new_day(self):
+        dates = pd.to_datetime(["2026-03-09", "2026-03-10"])
+        prices_df = pd.DataFrame({"ETF A": [100.0, 101.0], "ETF B": [50.0, 51.0]}, index=dates)
+        targets = [
+            {"code": "A", "name": "ETF A", "quantity": 1},
+            {"code": "B", "name": "ETF B", "quantity": 1},
+        ]
+
+        same_day = apply_latest_quotes(
+            prices_df, targets, {"A": (pd.Timestamp("2026-03-10"), 102.0)}
+        )
+        next_day = apply_latest_quotes(
+            same_day,
+            targets,
+            {
+                "A": (pd.Timestamp("2026-03-11"), 103.0),
+                "B": (pd.Timestamp("2026-03-09"), 0.0),
+            },
+        )
+
+        self.assertIs(same_day, prices_df)
+        self.assertEqual(same_day["ETF A"].tolist(), [100.0, 102.0])
+        self.assertEqual(next_day.index[-1], pd.Timestamp("2026-03-11"))
+        self.assertEqual(next_day["ETF A"].tolist(), [100.0, 102.0, 103.0])
+        self.assertEqual(next_day["ETF B"].tolist()[:2], [50.0, 51.0])
+        self.assertTrue(pd.isna(next_day["ETF B"].iloc[-1]))
+
+    @patch("app.fetch_latest_quotes")
+    def test_refresh_intraday_prices_returns_frames_later_polls_do_not_modify(self, mock_quotes):
+        dates = pd.to_datetime(["2026-03-09", "2026-03-10"])
+        daily_prices = pd.DataFrame({"ETF A": [100.0, 101.0]}, index=dates)
+        targets = [{"code": "A", "name": "ETF A", "quantity": 1}]
+
+        mock_quotes.return_value = {"A": (dates[-1], 110.0)}
+        first = refresh_intraday_prices("Live Test", targets, dates[0], daily_prices, 30)
+        mock_quotes.return_value = {"A": (dates[-1], 120.0)}
+        second = refresh_intraday_prices("Live Test", targets, dates[0], daily_prices, 30)
+
+        self.assertEqual(first["ETF A"].tolist(), [100.0, 110.0])
+        self.assertEqual(second["ETF A"].tolist(), [100.0, 120.0])
+        self.assertEqual(daily_prices["ETF A"].tolist(), [100.0, 101.0])
+
+    @patch("app.ROLLING_STATE_LIMIT", 2)
+    @patch("app.fetch_latest_quotes", return_value={})
+    def test_refresh_intraday_prices_keeps_only_recent_windows(self, _):
+        dates = pd.to_datetime(["2026-03-09", "2026-03-10"])
+        daily_prices = pd.DataFrame({"ETF A": [100.0, 101.0]}, index=dates)
+        targets = [{"code": "A", "name": "ETF A", "quantity": 1}]
+
+        for start_date in ("2026-01-01", "2026-01-02", "2026-01-01", "2026-01-03"):
+            refresh_intraday_prices("Bounded Test", targets, start_date, daily_prices, 30)
+
+        self.assertEqual(
+            [key for key in get_intraday_store()["frames"] if key[0] == "Bounded Test"],
+            [("Bounded Test", "2026-01-01"), ("Bounded Test", "2026-01-03")],
+        )
+
     def test_load_target_records_supports_default_quantity_and_comments(self):
         with TemporaryDirectory() as tmp_dir:
             target_file = Path(tmp_dir) / "targets.txt"
@@ -104,6 +294,72 @@ class TestApp(unittest.TestCase):
             with self.assertRaises(TargetConfigError):
                 load_target_records(target_file)
 
+    def test_load_target_records_reuses_cache_until_file_changes(self):
+        with TemporaryDirectory() as tmp_dir:
+            target_file = Path(tmp_dir) / "targets.txt"
+            target_file.write_text("005930|삼성전자|3\n", encoding="utf-8")
+
+            first = load_target_records(target_file)
+            second = load_target_records(target_file)
+            target_file.write_text("005930|삼성전자|3\nTSLA|Tesla|2\n", encoding="utf-8")
+            third = load_target_records(target_file)
+
+        self.assertIs(first, second)
+        self.assertEqual([record["code"] for record in third], ["005930", "TSLA"])
+
+    def test_load_target_records_streams_bulk_csv_and_parquet_universes(self):
+        with TemporaryDirectory() as tmp_dir:
+            csv_file = Path(tmp_dir) / "kospi.csv"
+            csv_file.write_text(
+                "Code,ISU_CD,Name,Market\n005930,KR7005930003,삼성전자,KOSPI\n000660,KR7000660001,SK하이닉스,KOSPI\n",
+                encoding="utf-8",
+            )
+            parquet_file = Path(tmp_dir) / "sp500.parquet"
+            pd.DataFrame(
+                {"Symbol": ["AAPL", "MSFT"], "Name": ["Apple", None], "Quantity": [3, None]}
+            ).to_parquet(parquet_file)
+
+            csv_records = load_target_records(csv_file)
+            parquet_records = load_target_records(parquet_file)
+
+        self.assertEqual(
+            csv_records,
+            [
+                {"code": "005930", "name": "삼성전자", "quantity": 1},
+                {"code": "000660", "name": "SK하이닉스", "quantity": 1},
+            ],
+        )
+        self.assertEqual(
+            parquet_records,
+            [
+                {"code": "AAPL", "name": "Apple", "quantity": 3},
+                {"code": "MSFT", "name": "MSFT", "quantity": 1},
+            ],
+        )
+
+    def test_load_target_records_rejects_duplicate_universe_codes(self):
+        with TemporaryDirectory() as tmp_dir:
+            csv_file = Path(tmp_dir) / "universe.csv"
+            csv_file.write_text("symbol,name\nAAPL,Apple\nMSFT,Microsoft\nAAPL,Apple\n", encoding="utf-8")
+
+            with self.assertRaisesRegex(TargetConfigError, "universe.csv:4 .*AAPL.*universe.csv:2"):
+                load_target_records(csv_file)
+
+    def test_load_all_targets_adds_universe_files_as_categories(self):
+        with TemporaryDirectory() as tmp_dir:
+            target_file = Path(tmp_dir) / "etfs.txt"
+            target_file.write_text("226490|KODEX 코스피|1\n", encoding="utf-8")
+            universe_dir = Path(tmp_dir) / "universes"
+            universe_dir.mkdir()
+            (universe_dir / "KOSPI 200.csv").write_text("Code,Name\n005930,삼성전자\n", encoding="utf-8")
+            (universe_dir / "notes.md").write_text("ignored", encoding="utf-8")
+
+            with patch("app.TARGET_FILES", {"ETFs": target_file}), patch("app.UNIVERSE_DIR", universe_dir):
+                targets = load_all_targets()
+
+        self.assertEqual(list(targets), ["ETFs", "KOSPI 200"])
+        self.assertEqual(targets["KOSPI 200"][0]["name"], "삼성전자")
+
     def test_calculate_period_summary_uses_first_valid_date_per_symbol(self):
         dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"])
         prices_df = pd.DataFrame(
@@ -226,6 +482,63 @@ class TestApp(unittest.TestCase):
         self.assertAlmostEqual(portfolio[1]["market_value"], 200.0)
         self.assertAlmostEqual(portfolio[1]["weight"], 40.0)
 
+    def test_convert_prices_to_base_uses_last_fx_rate_on_or_before_each_date(self):
+        dates = pd.to_datetime(["2026-01-02", "2026-01-05", "2026-01-06"])
+        prices_df = pd.DataFrame(
+            {"삼성전자": [1000.0, 1100.0, 1200.0], "Tesla": [10.0, None, 12.0]},
+            index=dates,
+        )
+        fx_df = pd.DataFrame(
+            {"USD": [1400.0, 1450.0]},
+            index=pd.to_datetime(["2026-01-03", "2026-01-06"]),
+        )
+        currency_by_name = get_currency_map(
+            [
+                {"code": "005930", "name": "삼성전자", "quantity": 1},
+                {"code": "TSLA", "name": "Tesla", "quantity": 1},
+            ]
+        )
+
+        converted = convert_prices_to_base(prices_df, currency_by_name, fx_df)
+
+        self.assertEqual(currency_by_name, {"삼성전자": "KRW", "Tesla": "USD"})
+        self.assertEqual(converted["삼성전자"].tolist(), [1000.0, 1100.0, 1200.0])
+        self.assertTrue(pd.isna(converted.loc[dates[0], "Tesla"]))
+        self.assertTrue(pd.isna(converted.loc[dates[1], "Tesla"]))
+        self.assertAlmostEqual(converted.loc[dates[2], "Tesla"], 17400.0)
+
+    def test_calculate_portfolio_weights_converts_foreign_prices_with_fx_rate(self):
+        summary = attach_fx_rates(
+            [
+                {"name": "삼성전자", "current_price": 60000.0, "quantity": 1, "date": "2026-01-06"},
+                {"name": "Tesla", "current_price": 40.0, "quantity": 1, "date": "2026-01-06"},
+            ],
+            {"삼성전자": "KRW", "Tesla": "USD"},
+            pd.DataFrame({"USD": [1500.0]}, index=pd.to_datetime(["2026-01-05"])),
+        )
+
+        portfolio = calculate_portfolio_weights(summary)
+
+        self.assertEqual(summary[1]["fx_rate"], 1500.0)
+        self.assertEqual([item["name"] for item in portfolio], ["삼성전자", "Tesla"])
+        self.assertAlmostEqual(portfolio[1]["market_value"], 60000.0)
+        self.assertAlmostEqual(portfolio[1]["weight"], 50.0)
+
+    def test_find_missing_fx_holdings_lists_holdings_dropped_without_fx_rate(self):
+        summary = attach_fx_rates(
+            [
+                {"name": "국내 ETF", "current_price": 10000.0, "quantity": 1, "date": "2026-01-02"},
+                {"name": "US ETF", "current_price": 100.0, "quantity": 1, "date": "2026-01-02"},
+            ],
+            {"국내 ETF": "KRW", "US ETF": "USD"},
+            pd.DataFrame(),
+        )
+
+        weights = calculate_portfolio_weights(summary)
+
+        self.assertEqual([item["name"] for item in weights], ["국내 ETF"])
+        self.assertEqual(find_missing_fx_holdings(summary), [{"name": "US ETF", "currency": "USD"}])
+
     def test_calculate_portfolio_weights_respects_visible_names(self):
         summary = [
             {"name": "삼성전자", "current_price": 100.0, "quantity": 2},
@@ -257,6 +570,105 @@ class TestApp(unittest.TestCase):
         self.assertAlmostEqual(summary[0]["current_price"], 120.0)
         self.assertAlmostEqual(summary[0]["return"], 20.0)
 
+    def test_select_metric_cards_supports_search_top_bottom_and_paging(self):
+        summary = [
+            {"name": f"ETF {index:02d}", "return": float(index)} for index in range(30, 0, -1)
+        ]
+
+        first_page, page_count, match_count = select_metric_cards(summary, page_size=24)
+        last_page, _, _ = select_metric_cards(summary, page=9, page_size=24)
+        top, _, _ = select_metric_cards(summary, "Top N", top_n=3)
+        bottom, _, _ = select_metric_cards(summary, "Bottom N", top_n=3)
+        searched, _, searched_count = select_metric_cards(summary, query=" etf 1")
+
+        self.assertEqual((len(first_page), page_count, match_count), (24, 2, 30))
+        self.assertEqual([item["name"] for item in last_page][0], "ETF 06")
+        self.assertEqual([item["name"] for item in top], ["ETF 30", "ETF 29", "ETF 28"])
+        self.assertEqual([item["name"] for item in bottom], ["ETF 01", "ETF 02", "ETF 03"])
+        self.assertEqual(searched_count, 10)
+
+    def test_build_metric_card_html_is_memoized_per_card_state(self):
+        build_metric_card_html.cache_clear()
+
+        first = build_metric_card_html("A&B", 1234.5, -1.234, "2026-01-02", True)
+        second = build_metric_card_html("A&B", 1234.5, -1.234, "2026-01-02", True)
+        hidden = build_metric_card_html("A&B", 1234.5, -1.234, "2026-01-02", False)
+
+        self.assertIs(first, second)
+        self.assertEqual(build_metric_card_html.cache_info().hits, 1)
+        self.assertIn('<div class="metric-label">A&amp;B</div>', first)
+        self.assertIn('<div class="metric-value">1,234</div>', first)
+        self.assertIn('<div class="metric-delta delta-negative">-1.23%</div>', first)
+        self.assertIn("card-off", hidden)
+
+    def test_iter_export_bytes_streams_window_in_chunks_for_every_format(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        dates = pd.date_range("2026-01-01", periods=10)
+        prices_df = pd.DataFrame(
+            {"ETF A": np.arange(100.0, 110.0), "신규 ETF": [None] * 4 + list(np.arange(50.0, 56.0))},
+            index=dates,
+        )
+        expected = prices_df.loc["2026-01-02":"2026-01-09"].rename_axis("Date")
+
+        csv_chunks = list(
+            iter_export_bytes(iter_price_chunks(prices_df, dates[1], dates[8], chunk_rows=3), "csv")
+        )
+        parquet_bytes = b"".join(
+            iter_export_bytes(iter_price_chunks(prices_df, dates[1], dates[8], chunk_rows=3), "parquet")
+        )
+        arrow_bytes = b"".join(
+            iter_export_bytes(iter_price_chunks(prices_df, dates[1], dates[8], chunk_rows=3), "arrow")
+        )
+
+        self.assertEqual(len(csv_chunks), 3)
+        self.assertEqual(b"".join(csv_chunks).decode("utf-8"), expected.to_csv())
+        self.assertEqual(pq.ParquetFile(io.BytesIO(parquet_bytes)).num_row_groups, 3)
+        pd.testing.assert_frame_equal(
+            pq.read_table(io.BytesIO(parquet_bytes)).to_pandas(), expected, check_freq=False
+        )
+        pd.testing.assert_frame_equal(
+            pa.ipc.open_stream(arrow_bytes).read_pandas(), expected, check_freq=False
+        )
+
+    def test_build_export_file_returns_data_download_button_accepts(self):
+        from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+        dates = pd.date_range("2026-01-01", periods=5)
+        prices_df = pd.DataFrame({"ETF A": np.arange(100.0, 105.0)}, index=dates)
+
+        data = build_export_file(
+            iter_export_bytes(iter_price_chunks(prices_df, dates[0], dates[-1], chunk_rows=2), "csv")
+        )
+        data_bytes, _ = convert_data_to_bytes_and_infer_mime(data, TypeError("unsupported"))
+
+        self.assertEqual(data_bytes.decode("utf-8"), prices_df.rename_axis("Date").to_csv())
+
+    def test_iter_normalized_chunks_matches_chart_normalization(self):
+        dates = pd.date_range("2026-01-01", periods=6)
+        prices_df = pd.DataFrame(
+            {
+                "기존 ETF": [100, 110, 120, 130, 140, 150],
+                "신규 ETF": [None, None, 50, 55, 60, 65],
+                "빈 종목": [None] * 6,
+            },
+            index=dates,
+        )
+
+        expected = normalize_prices_for_chart(
+            prices_df, list(prices_df.columns), dates[0], dates[-1]
+        )
+
+        for chunk_rows in (1, 2, 4):
+            with self.subTest(chunk_rows=chunk_rows):
+                streamed = pd.concat(
+                    iter_normalized_chunks(prices_df, dates[0], dates[-1], chunk_rows=chunk_rows)
+                )
+                pd.testing.assert_frame_equal(
+                    streamed, expected, check_names=False, check_freq=False
+                )
+
     def test_build_chart_keeps_expected_pyecharts_options(self):
         dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03"])
         norm_df = pd.DataFrame(
@@ -272,6 +684,84 @@ class TestApp(unittest.TestCase):
         self.assertEqual(len(chart.options["series"]), 2)
         self.assertEqual(chart.options["yAxis"][0]["name"], "Base 100")
 
+    def test_normalize_prices_with_stats_returns_per_column_min_max_last(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"])
+        prices_df = pd.DataFrame(
+            {
+                "ETF A": [100, 120, 90, None],
+                "신규 ETF": [None, 50, 75, 60],
+                "빈 종목": [None] * 4,
+            },
+            index=dates,
+        )
+
+        norm_df, stats = normalize_prices_with_stats(
+            prices_df, ["신규 ETF", "ETF A", "빈 종목"], dates[0], dates[-1]
+        )
+
+        self.assertEqual(norm_df.columns.tolist(), ["신규 ETF", "ETF A"])
+        self.assertEqual(stats.index.tolist(), ["신규 ETF", "ETF A"])
+        self.assertEqual(stats.loc["ETF A"].tolist(), [90.0, 120.0, 90.0])
+        self.assertEqual(stats.loc["신규 ETF"].tolist(), [100.0, 150.0, 120.0])
+        self.assertEqual(get_axis_bounds(norm_df, stats), get_axis_bounds(norm_df))
+        self.assertEqual(get_axis_bounds(norm_df, stats), (80, 170))
+
+    def test_build_chart_uses_stats_for_end_labels_and_tooltips(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03"])
+        norm_df = pd.DataFrame(
+            {"ETF A": [100.0, 130.0, 110.0], "ETF B": [100.0, None, 98.5]}, index=dates
+        )
+
+        chart = build_chart(norm_df)
+        dumped = chart.dump_options()
+
+        self.assertIn('"formatter": "ETF A +10.0%"', dumped)
+        self.assertIn('"formatter": "ETF B -1.5%"', dumped)
+        self.assertIn("var ranges = [[100.0, 130.0], [98.5, 100.0]];", dumped)
+
+    @patch("app.normalize_prices_with_stats", wraps=normalize_prices_with_stats)
+    def test_get_normalized_chart_data_reuses_stats_until_last_row_changes(self, mock_normalize):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03"])
+        prices_df = pd.DataFrame({"ETF A": [100.0, 110.0, 120.0]}, index=dates)
+        args = ("Stats Test", "Daily")
+
+        get_normalized_chart_data(*args, prices_df, ["ETF A"], dates[0], dates[-1])
+        _, cached_stats = get_normalized_chart_data(
+            *args, prices_df.copy(), ["ETF A"], dates[0], dates[-1]
+        )
+        live_prices = prices_df.copy()
+        live_prices.iloc[-1, 0] = 130.0
+        _, live_stats = get_normalized_chart_data(*args, live_prices, ["ETF A"], dates[0], dates[-1])
+
+        self.assertEqual(mock_normalize.call_count, 2)
+        self.assertEqual(cached_stats.loc["ETF A", "last"], 120.0)
+        self.assertEqual(live_stats.loc["ETF A", "last"], 130.0)
+
+    def test_get_normalized_chart_data_sees_last_row_patched_in_place(self):
+        dates = pd.to_datetime(["2026-03-09", "2026-03-10"])
+        prices_df = pd.DataFrame({"ETF A": [100.0, 101.0], "ETF B": [50.0, 51.0]}, index=dates)
+        targets = [{"code": "A", "name": "ETF A", "quantity": 1}]
+        args = ("In-place Test", "Daily")
+
+        get_normalized_chart_data(*args, prices_df, ["ETF A"], dates[0], dates[-1])
+        patched = apply_latest_quotes(prices_df, targets, {"A": (dates[-1], 120.0)})
+        _, stats = get_normalized_chart_data(*args, patched, ["ETF A"], dates[0], dates[-1])
+
+        self.assertIs(patched, prices_df)
+        self.assertEqual(stats.loc["ETF A", "last"], 120.0)
+
+    def test_get_normalized_chart_data_recomputes_when_history_is_revised(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03"])
+        prices_df = pd.DataFrame({"ETF A": [100.0, 110.0, 120.0]}, index=dates)
+        args = ("Revised Test", "Daily")
+
+        get_normalized_chart_data(*args, prices_df, ["ETF A"], dates[0], dates[-1])
+        adjusted = prices_df.copy()
+        adjusted.iloc[:2] /= 2
+        _, stats = get_normalized_chart_data(*args, adjusted, ["ETF A"], dates[0], dates[-1])
+
+        self.assertEqual(stats.loc["ETF A", "last"], 240.0)
+
     def test_build_portfolio_chart_keeps_expected_pyecharts_options(self):
         chart = build_portfolio_chart(
             [
@@ -285,5 +775,327 @@ class TestApp(unittest.TestCase):
         self.assertEqual(chart.options["series"][0]["data"][0]["name"], "ETF A")
         self.assertEqual(chart.options["series"][0]["data"][0]["value"], 60.0)
 
+    def test_calculate_correlation_matrix_matches_pairwise_complete_pandas_corr(self):
+        rng = np.random.default_rng(7)
+        returns_df = pd.DataFrame(rng.normal(0, 0.01, size=(60, 7)))
+        returns_df.iloc[:25, 2] = np.nan
+        returns_df.iloc[40:, 5] = np.nan
+        returns_df.iloc[::7, 6] = np.nan
+
+        corr = calculate_correlation_matrix(returns_df.to_numpy(), block_size=3)
+
+        np.testing.assert_allclose(corr, returns_df.corr(min_periods=2).to_numpy(), atol=1e-10)
+
+    def test_calculate_return_correlation_keeps_delayed_start_overlap(self):
+        dates = pd.date_range("2026-01-01", periods=6)
+        prices_df = pd.DataFrame(
+            {
+                "기존 ETF": [100, 101, 103, 102, 104, 107],
+                "신규 ETF": [None, None, 50, 49, 51, 54],
+                "빈 종목": [None] * 6,
+            },
+            index=dates,
+        )
+
+        corr_df = calculate_return_correlation(prices_df, dates[0], dates[-1])
+        returns = calculate_daily_returns(prices_df[["기존 ETF", "신규 ETF"]])
+        expected = pd.DataFrame(returns).corr().iloc[0, 1]
+
+        self.assertEqual(corr_df.columns.tolist(), ["기존 ETF", "신규 ETF"])
+        self.assertAlmostEqual(corr_df.loc["기존 ETF", "신규 ETF"], expected)
+        self.assertAlmostEqual(corr_df.loc["신규 ETF", "신규 ETF"], 1.0)
+
+    def test_cluster_correlation_order_groups_correlated_symbols(self):
+        rng = np.random.default_rng(3)
+        factor_a = rng.normal(size=200)
+        factor_b = rng.normal(size=200)
+        returns = np.column_stack(
+            [
+                factor_a + rng.normal(scale=0.1, size=200),
+                factor_b + rng.normal(scale=0.1, size=200),
+                factor_a + rng.normal(scale=0.1, size=200),
+                factor_b + rng.normal(scale=0.1, size=200),
+                factor_a + rng.normal(scale=0.1, size=200),
+            ]
+        )
+
+        order = cluster_correlation_order(calculate_correlation_matrix(returns))
+        groups = ["a" if index in (0, 2, 4) else "b" for index in order]
+
+        self.assertEqual(sorted(order), [0, 1, 2, 3, 4])
+        self.assertIn(groups, [["a", "a", "a", "b", "b"], ["b", "b", "a", "a", "a"]])
+
+    def test_limit_correlation_labels_keeps_preferred_symbols_in_matrix_order(self):
+        labels = [f"ETF {index}" for index in range(5)]
+        corr_df = pd.DataFrame(np.eye(5), index=labels, columns=labels)
+
+        limited = limit_correlation_labels(corr_df, ["ETF 3", "없는 종목", "ETF 1", "ETF 4"], limit=2)
+
+        self.assertEqual(limited.index.tolist(), ["ETF 1", "ETF 3"])
+        self.assertEqual(limited.columns.tolist(), ["ETF 1", "ETF 3"])
+        self.assertIs(limit_correlation_labels(corr_df, [], limit=5), corr_df)
+
+    def test_build_correlation_chart_keeps_expected_pyecharts_options(self):
+        corr_df = pd.DataFrame(
+            [[1.0, 0.5], [0.5, np.nan]],
+            index=["ETF A", "ETF B"],
+            columns=["ETF A", "ETF B"],
+        )
+
+        chart = build_correlation_chart(corr_df)
+
+        self.assertEqual(chart.options["series"][0]["type"], "heatmap")
+        self.assertEqual(len(chart.options["series"][0]["data"]), 4)
+        self.assertIn([1, 1, "-"], chart.options["series"][0]["data"])
+
+    def test_calculate_horizon_returns_uses_last_valid_price_on_or_before_anchor(self):
+        dates = pd.to_datetime(
+            ["2025-12-30", "2025-12-31", "2026-01-02", "2026-03-01", "2026-03-05", "2026-03-09"]
+        )
+        prices_df = pd.DataFrame(
+            {
+                "기존 ETF": [100, None, 110, 120, 125, 150],
+                "신규 ETF": [None, None, 40, 50, 55, None],
+            },
+            index=dates,
+        )
+
+        table = calculate_horizon_returns(prices_df, pd.Timestamp("2026-03-10"))
+
+        self.assertEqual(table.columns.tolist(), ["1W", "1M", "3M", "YTD", "1Y", "3Y"])
+        self.assertAlmostEqual(table.loc["기존 ETF", "1W"], 25.0)
+        self.assertAlmostEqual(table.loc["기존 ETF", "1M"], 150 / 110 * 100 - 100)
+        self.assertAlmostEqual(table.loc["기존 ETF", "YTD"], 50.0)
+        self.assertTrue(pd.isna(table.loc["기존 ETF", "3M"]))
+        self.assertAlmostEqual(table.loc["신규 ETF", "1W"], 10.0)
+        self.assertAlmostEqual(table.loc["신규 ETF", "1M"], 37.5)
+        self.assertTrue(pd.isna(table.loc["신규 ETF", "YTD"]))
+
+    def test_update_rolling_analytics_matches_full_recompute_after_append(self):
+        rng = np.random.default_rng(11)
+        dates = pd.bdate_range("2025-01-01", periods=80)
+        prices_df = pd.DataFrame(
+            {
+                "ETF A": 100 * np.cumprod(1 + rng.normal(0, 0.01, size=80)),
+                "ETF B": 50 * np.cumprod(1 + rng.normal(0, 0.02, size=80)),
+            },
+            index=dates,
+        )
+        prices_df.iloc[:30, 1] = np.nan
+
+        state = update_rolling_analytics(None, prices_df.iloc[:78], window=20)
+        revised = prices_df.copy()
+        revised.iloc[77, 0] *= 1.05
+        state = update_rolling_analytics(state, revised, window=20)
+        expected = calculate_rolling_analytics(revised, 20)
+
+        for key in ("moving_average", "rolling_return", "volatility"):
+            pd.testing.assert_frame_equal(state[key], expected[key], rtol=1e-9)
+        self.assertTrue(state["index"].equals(revised.index))
+
+    @patch("app.calculate_rolling_analytics", wraps=calculate_rolling_analytics)
+    def test_update_rolling_analytics_rebuilds_when_history_is_revised(self, mock_calculate):
+        dates = pd.bdate_range("2025-01-01", periods=60)
+        prices_df = pd.DataFrame({"ETF A": np.linspace(100, 159, 60)}, index=dates)
+        state = update_rolling_analytics(None, prices_df.iloc[:50], window=20)
+
+        adjusted = prices_df.copy()
+        adjusted.iloc[:40] /= 2
+        state = update_rolling_analytics(state, adjusted, window=20)
+        expected = calculate_rolling_analytics(adjusted, 20)
+
+        self.assertEqual(len(mock_calculate.call_args.args[0]), 60)
+        pd.testing.assert_frame_equal(state["moving_average"], expected["moving_average"])
+
+    def test_resample_last_valid_keeps_last_close_per_bin_at_last_trading_date(self):
+        prices_df = pd.DataFrame(
+            {"A": [1.0, 2.0, 3.0, 4.0, 5.0], "B": [10.0, 20.0, np.nan, 40.0, np.nan]},
+            index=pd.to_datetime(["2026-01-28", "2026-01-30", "2026-02-02", "2026-02-26", "2026-02-27"]),
+        )
+
+        monthly = resample_last_valid(prices_df, "M")
+
+        self.assertEqual(monthly.index.strftime("%Y-%m-%d").tolist(), ["2026-01-30", "2026-02-27"])
+        self.assertEqual(monthly["A"].tolist(), [2.0, 5.0])
+        self.assertEqual(monthly["B"].tolist(), [20.0, 40.0])
+
+    def test_update_price_pyramid_matches_full_rebuild_after_append(self):
+        dates = pd.bdate_range("2026-01-01", periods=90)
+        prices_df = pd.DataFrame(
+            {"A": np.linspace(100, 190, 90), "B": np.r_[np.full(30, np.nan), np.linspace(50, 80, 60)]},
+            index=dates,
+        )
+        state = update_price_pyramid(None, prices_df.iloc[:47])
+
+        updated = update_price_pyramid(state, prices_df)
+        rebuilt = update_price_pyramid(None, prices_df)
+
+        for resolution in ("Daily", "Weekly", "Monthly"):
+            pd.testing.assert_frame_equal(updated[resolution], rebuilt[resolution])
+        self.assertEqual(len(updated["Monthly"]), 5)
+
+    def test_update_price_pyramid_rebuilds_when_history_is_revised(self):
+        dates = pd.bdate_range("2026-01-01", periods=90)
+        prices_df = pd.DataFrame({"A": np.linspace(100, 190, 90)}, index=dates)
+        state = update_price_pyramid(None, prices_df.iloc[:60])
+
+        adjusted = prices_df.copy()
+        adjusted.iloc[:50] /= 2
+        updated = update_price_pyramid(state, adjusted)
+
+        pd.testing.assert_frame_equal(
+            updated["Monthly"], update_price_pyramid(None, adjusted)["Monthly"]
+        )
+
+    def test_build_window_level_spans_window_and_rebases_on_daily_close(self):
+        dates = pd.bdate_range("2026-01-05", periods=40)
+        prices_df = pd.DataFrame(
+            {"A": np.linspace(100, 139, 40), "B": np.r_[np.full(8, np.nan), np.linspace(50, 81, 32)]},
+            index=dates,
+        )
+        start_date, end_date = pd.Timestamp("2026-01-07"), pd.Timestamp("2026-02-18")
+        level_df = update_price_pyramid(None, prices_df)["Weekly"]
+
+        from_level = build_window_level(prices_df, "W", start_date, end_date, level_df)
+        from_window = build_window_level(prices_df, "W", start_date, end_date)
+        norm_df, stats = normalize_prices_with_stats(
+            from_level, ["A", "B"], start_date, end_date, prices_df
+        )
+        summary = {
+            item["name"]: item["return"]
+            for item in calculate_period_summary(prices_df, start_date, end_date)
+        }
+
+        pd.testing.assert_frame_equal(from_level, from_window)
+        self.assertEqual(from_level.index[0], start_date)
+        self.assertEqual(from_level.index[-1], end_date)
+        self.assertEqual(from_level.index[1], pd.Timestamp("2026-01-09"))
+        for name in ("A", "B"):
+            self.assertAlmostEqual(stats.loc[name, "last"] - 100, summary[name])
+        self.assertAlmostEqual(norm_df.loc["2026-01-16", "B"], 100 + 100 * 1 / 50)
+
+    def test_select_price_resolution_uses_coarsest_level_that_fills_the_chart(self):
+        self.assertEqual(select_price_resolution("2025-01-01", "2026-01-01"), "Daily")
+        self.assertEqual(select_price_resolution("2016-01-01", "2026-01-01"), "Weekly")
+        self.assertEqual(select_price_resolution("1990-01-01", "2026-01-01"), "Monthly")
+        self.assertEqual(
+            select_price_resolution("2016-01-01", "2026-01-01", min_points=120), "Monthly"
+        )
+
+    def test_build_chart_adds_rolling_overlay_on_secondary_axis(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03"])
+        norm_df = pd.DataFrame({"ETF A": [100.0, 105.0, 110.0]}, index=dates)
+        overlay_df = pd.DataFrame({"ETF A": [None, 12.5, 13.0]}, index=dates)
+
+        chart = build_chart(
+            norm_df, overlay_df, overlay_label="Rolling Volatility", overlay_secondary_axis=True
+        )
+
+        self.assertEqual(len(chart.options["series"]), 2)
+        self.assertEqual(len(chart.options["yAxis"]), 2)
+        self.assertEqual(chart.options["series"][1]["yAxisIndex"], 1)
+        self.assertIsNone(chart.options["series"][1]["markLine"])
+
+    def test_simulate_portfolio_scenarios_values_all_scenarios_at_once(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"])
+        prices_df = pd.DataFrame(
+            {
+                "ETF A": [100, 80, None, 120],
+                "ETF B": [None, 10, 20, 10],
+            },
+            index=dates,
+        )
+        quantity_df = pd.DataFrame(
+            {"ETF A": [1, 0], "ETF B": [0, 2]}, index=["Only A", "Only B"]
+        )
+
+        values_df, summary_df = simulate_portfolio_scenarios(
+            prices_df, quantity_df, dates[0], dates[-1]
+        )
+
+        self.assertEqual(values_df["Only A"].tolist(), [100.0, 80.0, 80.0, 120.0])
+        self.assertEqual(values_df["Only B"].tolist(), [20.0, 20.0, 40.0, 20.0])
+        self.assertAlmostEqual(summary_df.loc["Only A", "return"], 20.0)
+        self.assertAlmostEqual(summary_df.loc["Only A", "max_drawdown"], -20.0)
+        self.assertAlmostEqual(summary_df.loc["Only B", "start_value"], 20.0)
+        self.assertAlmostEqual(summary_df.loc["Only B", "max_drawdown"], -50.0)
+
+    def test_simulate_portfolio_scenarios_holds_late_listing_weight_as_cash(self):
+        dates = pd.date_range("2026-01-01", periods=6)
+        prices_df = pd.DataFrame(
+            {"ETF A": [100.0] * 6, "ETF B": [None, None, None, 100.0, 100.0, 100.0]},
+            index=dates,
+        )
+        quantities = weights_to_quantities(
+            pd.DataFrame({"ETF A": [0.5], "ETF B": [0.5]}, index=["Half"]),
+            prices_df,
+            dates[0],
+            dates[-1],
+            1000,
+        )
+
+        values_df, summary_df = simulate_portfolio_scenarios(
+            prices_df, quantities, dates[0], dates[-1]
+        )
+
+        self.assertEqual(values_df["Half"].tolist(), [1000.0] * 6)
+        self.assertAlmostEqual(summary_df.loc["Half", "start_value"], 1000.0)
+        self.assertAlmostEqual(summary_df.loc["Half", "return"], 0.0)
+
+    def test_validate_scenario_upload_rejects_reserved_duplicate_and_non_numeric(self):
+        reserved = ["Current", "Equal Weight"]
+        valid = validate_scenario_upload(
+            pd.DataFrame({"ETF A": ["1", 2], "ETF B": [None, "3.5"]}, index=["Mine", 7]),
+            reserved,
+        )
+
+        self.assertEqual(valid.index.tolist(), ["Mine", "7"])
+        self.assertEqual(valid["ETF B"].tolist()[1], 3.5)
+        self.assertTrue(pd.isna(valid.loc["Mine", "ETF B"]))
+        with self.assertRaisesRegex(ValueError, "Current"):
+            validate_scenario_upload(pd.DataFrame({"ETF A": [1]}, index=["Current"]), reserved)
+        with self.assertRaisesRegex(ValueError, "Mine"):
+            validate_scenario_upload(
+                pd.DataFrame({"ETF A": [1, 2]}, index=["Mine", "Mine"]), reserved
+            )
+        with self.assertRaisesRegex(ValueError, "Mine/ETF A"):
+            validate_scenario_upload(pd.DataFrame({"ETF A": ["abc"]}, index=["Mine"]), reserved)
+
+    def test_weights_to_quantities_invests_capital_at_start_prices(self):
+        dates = pd.to_datetime(["2026-01-01", "2026-01-02"])
+        prices_df = pd.DataFrame({"ETF A": [100, 110], "ETF B": [None, 50]}, index=dates)
+        weights_df = generate_weight_scenarios(["ETF A", "ETF B"], 3)
+
+        quantities = weights_to_quantities(weights_df, prices_df, dates[0], dates[-1], 1000)
+
+        self.assertEqual(len(quantities), 4)
+        self.assertAlmostEqual(quantities.loc["Equal Weight", "ETF A"], 5.0)
+        self.assertAlmostEqual(quantities.loc["Equal Weight", "ETF B"], 10.0)
+        np.testing.assert_allclose(weights_df.sum(axis=1), 1.0)
+
+    def test_import_app_stays_within_budget_without_heavy_dependencies(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, time\n"
+                "start = time.perf_counter()\n"
+                "import app\n"
+                "print(time.perf_counter() - start)\n"
+                "print(','.join(name for name in ('pandas', 'numpy', 'streamlit', "
+                "'streamlit_shadcn_ui', 'pyecharts', 'streamlit_echarts', 'FinanceDataReader') "
+                "if name in sys.modules))",
+            ],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed_text, loaded_modules = (result.stdout.splitlines() + [""])[:2]
+
+        self.assertLess(float(elapsed_text), IMPORT_TIME_BUDGET_SECONDS)
+        self.assertEqual(loaded_modules, "")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from benchmark_app import (
+    find_regressions,
+    load_baseline,
+    make_synthetic_prices,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class TestBenchmarkApp(unittest.TestCase):
+    def test_synthetic_prices_include_gaps_late_starts_and_delistings(self):
+        prices_df = make_synthetic_prices(400, 2, seed=7)
+        values = prices_df.to_numpy()
+        first_valid_rows = np.argmax(~np.isnan(values), axis=0)
+        last_valid_rows = len(values) - 1 - np.argmax(~np.isnan(values[::-1]), axis=0)
+
+        self.assertEqual(prices_df.shape, (504, 400))
+        self.assertTrue(prices_df.index.is_monotonic_increasing)
+        self.assertGreater((first_valid_rows > 10).sum(), 0)
+        self.assertGreater((last_valid_rows < len(values) - 10).sum(), 0)
+        self.assertTrue(np.all(values[~np.isnan(values)] > 0))
+        self.assertTrue(make_synthetic_prices(400, 2, seed=7).equals(prices_df))
+
+    def test_find_regressions_flags_cases_beyond_threshold(self):
+        baseline = {"a@10x1y": 1.0, "b@10x1y": 1.0}
+        baseline["tiny@10x1y"] = 0.0001
+        results = {"a@10x1y": 1.2, "b@10x1y": 1.5, "c@10x1y": 9.0, "tiny@10x1y": 0.0005}
+
+        regressions = find_regressions(results, baseline, threshold=0.25)
+
+        self.assertEqual([item["case"] for item in regressions], ["b@10x1y"])
+        self.assertAlmostEqual(regressions[0]["change"], 0.5)
+
+    def test_run_benchmarks_times_every_case_and_round_trips_baseline(self):
+        results = run_benchmarks([(5, 1)], repeat=1)
+
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "baseline.json"
+            save_baseline(path, results)
+            stored = json.loads(path.read_text(encoding="utf-8"))
+
+            self.assertEqual(load_baseline(path), results)
+
+        self.assertEqual(len(results), 7)
+        self.assertIn("build_portfolio_chart@5x1y", results)
+        self.assertIn("pandas", stored)
+        self.assertTrue(all(seconds >= 0 for seconds in results.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import subprocess
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pandas as pd
+
+from cli import main, parse_window
+
+
+class TestCli(unittest.TestCase):
+    def test_parse_window_supports_horizon_labels_and_explicit_ranges(self):
+        as_of = date(2026, 3, 10)
+
+        self.assertEqual(parse_window("YTD", as_of), ("YTD", date(2026, 1, 1), as_of))
+        self.assertEqual(parse_window("1M", as_of), ("1M", date(2026, 2, 10), as_of))
+        self.assertEqual(
+            parse_window("2025-01-01:2025-06-30", as_of),
+            ("2025-01-01:2025-06-30", date(2025, 1, 1), date(2025, 6, 30)),
+        )
+        with self.assertRaises(ValueError):
+            parse_window("2025-06-30:2025-01-01", as_of)
+
+    @patch("cli.load_all_targets")
+    @patch("app.fdr.DataReader")
+    def test_main_writes_reports_for_every_category_and_window(self, mock_reader, mock_targets):
+        mock_reader.return_value = pd.DataFrame(
+            {"Close": [100, 110, 121]},
+            index=pd.to_datetime(["2026-01-02", "2026-02-02", "2026-03-02"]),
+        )
+        mock_targets.return_value = {
+            "KR Stocks": [{"code": "CLI-KR", "name": "CLI 국내", "quantity": 2}],
+            "ETFs": [{"code": "CLI-ETF", "name": "CLI ETF", "quantity": 1}],
+        }
+
+        with TemporaryDirectory() as tmp_dir:
+            exit_code = main(
+                [
+                    "--as-of",
+                    "2026-03-10",
+                    "--window",
+                    "YTD",
+                    "--window",
+                    "2026-02-01:2026-03-10",
+                    "--format",
+                    "csv",
+                    "--format",
+                    "json",
+                    "--output-dir",
+                    tmp_dir,
+                ]
+            )
+            summary = pd.read_csv(Path(tmp_dir) / "summary.csv")
+            weights = json.loads((Path(tmp_dir) / "weights.json").read_text(encoding="utf-8"))
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(summary), 4)
+        self.assertEqual(sorted(summary["category"].unique()), ["ETFs", "KR Stocks"])
+        ytd_row = summary[(summary["name"] == "CLI 국내") & (summary["window"] == "YTD")].iloc[0]
+        self.assertAlmostEqual(ytd_row["return"], 21.0)
+        self.assertFalse(summary["excluded"].any())
+        self.assertEqual(len(weights), 4)
+        self.assertTrue(all(item["weight"] == 100.0 for item in weights))
+
+    def test_entry_point_does_not_load_ui_stack(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import runpy, sys\n"
+                "sys.argv = ['cli.py', '--help']\n"
+                "try:\n"
+                "    runpy.run_path('cli.py', run_name='__main__')\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print(any(name.split('.')[0] in ('streamlit', 'pyecharts') "
+                "and sys.modules[name] is not None for name in sys.modules))",
+            ],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import unittest
+
+import pandas as pd
+
+from load_test_app import StubDataReader, get_current_rss_mb, run_load_test
+
+
+class TestLoadTestApp(unittest.TestCase):
+    def test_stub_reader_is_deterministic_and_counts_calls(self):
+        reader = StubDataReader()
+
+        first = reader("005930", "2026-01-01")
+        second = reader("005930", "2026-01-01")
+        fx = reader("USD/KRW", "2026-01-01")
+
+        self.assertEqual(reader.calls, 3)
+        self.assertTrue(first.equals(second))
+        self.assertGreaterEqual(first.index[0], pd.Timestamp("2026-01-01"))
+        self.assertGreater(fx["Close"].iloc[0], 500)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "/proc/self/statm is Linux-only")
+    def test_get_current_rss_mb_tracks_allocations(self):
+        before = get_current_rss_mb()
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b"x" * len(block[::4096])
+        after = get_current_rss_mb()
+
+        self.assertGreater(after - before, 32)
+        del block
+
+    def test_run_load_test_reports_latency_fetches_and_memory_per_level(self):
+        results = run_load_test([1, 2], steps=3)
+
+        self.assertEqual([result["sessions"] for result in results], [1, 2])
+        for result in results:
+            self.assertEqual(result["errors"], [])
+            self.assertEqual(result["reruns"], result["sessions"] * 3)
+            self.assertGreater(result["fetches"], 0)
+            self.assertLessEqual(result["p50"], result["p99"])
+            self.assertLessEqual(result["p99"], result["max"])
+
+
+if __name__ == "__main__":
+    unittest.main()